@@ -0,0 +1,368 @@
+"""Vectorized NumPy simulator that advances thousands of timelines at once.
+
+Each game is one row in a set of arrays (stability, energy, entity slots,
+event counters) and every step applies the rules of ChronoSyncGame.advance_turn
+and the modelled actions to all rows together. Only the actions a scripted
+player needs for balance work are modelled: scan, resolve, stabilize, rest
+and analyze. Jumps, containment, NPCs and the archive are not.
+"""
+import numpy as np
+
+from content import default_content
+from main import (ChronoSyncGame, DIFFICULTY_SETTINGS, EVENT_EFFECTS, EventEffect, EventType,
+                  FREQUENCY_SETTINGS, REST_SETTINGS)
+from minigame import success_probability
+from policies import greedy_action
+
+WAIT, SCAN, RESOLVE, STABILIZE, REST, ANALYZE = range(6)
+
+
+class BatchSimulator:
+    """N independent games of one difficulty stored as NumPy arrays.
+
+    Entity and event storage is bounded by `max_entities` and `max_events`
+    slots per game; Reality Echo clones or events beyond that are dropped and
+    counted in `dropped_entities` / `dropped_events`. The paradox minigame is
+    modelled as a single roll with probability `resolve_success`, which
+    defaults to guessing distinct frequencies blindly (attempts / range);
+    "optimal" uses the success rate of the best strategy (see minigame.py).
+    """
+    def __init__(self, games, difficulty="MEDIUM", seed=None, max_entities=16, max_events=16,
+                 resolve_success=None):
+        self.rng = np.random.default_rng(seed)
+        self.difficulty = difficulty
+        self.decay, energy, stability = DIFFICULTY_SETTINGS[difficulty]
+        max_freq, attempts = FREQUENCY_SETTINGS[difficulty]
+        if resolve_success is None:
+            resolve_success = attempts / max_freq
+        elif resolve_success == "optimal":
+            resolve_success = success_probability(max_freq, attempts)
+        self.resolve_success = resolve_success
+        self.rest_energy, self.rest_cost = REST_SETTINGS[difficulty]
+
+        content = default_content()
+        self.base_paradox = np.array([e.paradox_value for e in content.entities], dtype=np.int16)
+        self.event_durations = np.array([e.duration for e in content.events], dtype=np.int16)
+        self._compile_effects(content.events)
+        self.story_length = len(content.story_beats)
+        templates = len(content.entities)
+
+        self.games = games
+        self.ids = np.arange(games)
+        self.stability = np.full(games, stability, np.int32)
+        self.energy = np.full(games, energy, np.int32)
+        self.game_time = np.zeros(games, np.int32)
+        self.story_beat = np.zeros(games, np.int16)
+        self.paradoxes_resolved = np.zeros(games, np.int32)
+        self.game_over = np.zeros(games, bool)
+        self.win = np.zeros(games, bool)
+
+        self.template = np.full((games, max_entities), -1, np.int16)
+        self.paradox = np.zeros((games, max_entities), np.int16)
+        self.present = np.zeros((games, max_entities), bool)
+        self.resolved = np.zeros((games, max_entities), bool)
+        self.discovered = np.zeros((games, max_entities), bool)
+        self.in_timeline = np.zeros((games, templates), bool)
+        self.weakness_items = np.zeros((games, templates), bool)
+        self.meditation_guide = np.zeros(games, bool)
+        self.remaining = np.zeros((games, max_events), np.int16)
+        self.event_type = np.zeros((games, max_events), np.int16)
+
+        self.dropped_entities = 0
+        self.dropped_events = 0
+        self.final_win = np.zeros(games, bool)
+        self.final_turns = np.zeros(games, np.int32)
+        self.final_resolved = np.zeros(games, np.int32)
+        self.finished = np.zeros(games, bool)
+
+        self._begin_mission()
+        self._advance_turn()
+
+    def _compile_effects(self, pool):
+        """Lay the declarative part of every event's EventEffect out as arrays
+        indexed by pool position; custom actions are looked up in
+        `vector_actions` by event type.
+        """
+        effects = [EVENT_EFFECTS.get(template.kind, EventEffect()) for template in pool]
+        unbounded = lambda e: e.paradox_limit if e.paradox_limit is not None else (99 if e.paradox > 0 else -99)
+        self.event_stability = np.array([e.stability for e in effects], np.int32)
+        self.event_energy = np.array([e.energy for e in effects], np.int32)
+        self.event_paradox = np.array([e.paradox for e in effects], np.int16)
+        self.event_paradox_limit = np.array([unbounded(e) for e in effects], np.int16)
+        self.event_extend = np.array([e.extend_events for e in effects], np.int16)
+
+        vector_actions = {EventType.RIFT: self._open_rift, EventType.ECHO: self._echo_entity}
+        self.event_actions = []
+        for i, (template, effect) in enumerate(zip(pool, effects)):
+            if effect.action is None:
+                continue
+            if template.kind not in vector_actions:
+                raise ValueError(f"no vectorized action for {template.kind}")
+            self.event_actions.append((i, vector_actions[template.kind]))
+
+    def _pick(self, mask):
+        """Choose one True column uniformly at random in each row of `mask`."""
+        keys = self.rng.random(mask.shape)
+        keys[~mask] = -1.0
+        return keys.argmax(1), mask.any(1)
+
+    def _begin_mission(self):
+        n = self.stability.size
+        order = self.rng.random((n, self.in_timeline.shape[1])).argsort(1)[:, :5]
+        self.template[:, :5] = order
+        self.paradox[:, :5] = self.base_paradox[order]
+        np.put_along_axis(self.in_timeline, order, True, 1)
+        self.discovered[:, :5] = self.rng.random((n, 5)) > 0.3
+        self._add_events(np.arange(n))
+
+    def _add_entity(self, rows, templates, paradox):
+        free = self.template[rows] < 0
+        slot = free.argmax(1)
+        room = free.any(1)
+        self.dropped_entities += int((~room).sum())
+        rows, slot, templates, paradox = rows[room], slot[room], templates[room], paradox[room]
+        self.template[rows, slot] = templates
+        self.paradox[rows, slot] = paradox
+        self.present[rows, slot] = False
+        self.resolved[rows, slot] = False
+        self.discovered[rows, slot] = False
+        return rows, slot
+
+    def _add_events(self, rows):
+        kind = self.rng.integers(0, self.event_durations.size, rows.size)
+
+        free = self.remaining[rows] <= 0
+        slot = free.argmax(1)
+        room = free.any(1)
+        self.dropped_events += int((~room).sum())
+        self.remaining[rows[room], slot[room]] = self.event_durations[kind[room]]
+        self.event_type[rows[room], slot[room]] = kind[room]
+
+        self.stability[rows] += self.event_stability[kind]
+        self.energy[rows] += self.event_energy[kind]
+
+        delta = self.event_paradox[kind]
+        shifted = rows[delta != 0]
+        if shifted.size:
+            delta, limit = delta[delta != 0, None], self.event_paradox_limit[kind[delta != 0], None]
+            value = self.paradox[shifted] + delta
+            value = np.where(delta > 0, np.minimum(limit, value), np.maximum(limit, value))
+            unresolved = (self.template[shifted] >= 0) & ~self.resolved[shifted]
+            self.paradox[shifted] = np.where(unresolved, value, self.paradox[shifted])
+
+        extend = self.event_extend[kind]
+        extended = rows[extend != 0]
+        self.remaining[extended] += extend[extend != 0, None] * (self.remaining[extended] > 0)
+
+        for index, action in self.event_actions:
+            selected = rows[kind == index]
+            if selected.size:
+                action(selected)
+
+    def _open_rift(self, rows):
+        chosen, ok = self._pick(~self.in_timeline[rows])
+        rows, chosen = rows[ok], chosen[ok]
+        self.in_timeline[rows, chosen] = True
+        added, slot = self._add_entity(rows, chosen, self.base_paradox[chosen])
+        seen = self.rng.random(added.size) > 0.7
+        self.discovered[added[seen], slot[seen]] = True
+
+    def _echo_entity(self, rows):
+        source, ok = self._pick(self.template[rows] >= 0)
+        rows, source = rows[ok], source[ok]
+        added, slot = self._add_entity(rows, self.template[rows, source], self.paradox[rows, source])
+        self.present[added, slot] = True
+        self.discovered[added, slot] = True
+
+    def _advance_turn(self):
+        rows = np.flatnonzero(~self.game_over)
+        n = rows.size
+        self.game_time[rows] += 1
+
+        beat = rows[(self.paradoxes_resolved[rows] > self.story_beat[rows]) &
+                    (self.story_beat[rows] < self.story_length - 1)]
+        self.story_beat[beat] += 1
+
+        decay = self.rng.integers(1, self.decay + 1, n)
+        self.stability[rows] = np.clip(self.stability[rows] - decay, 0, 100)
+        self.energy[rows] = np.minimum(100, self.energy[rows] + self.rng.integers(1, 3, n))
+
+        running = self.remaining[rows] > 0
+        self.remaining[rows] -= running
+
+        self._add_events(rows[self.rng.random(n) < 0.3])
+
+        roll = rows[self.rng.random(n) < 0.2]
+        found, ok = self._pick((self.template[roll] >= 0) & ~self.discovered[roll])
+        self.discovered[roll[ok], found[ok]] = True
+
+        lost = rows[self.stability[rows] <= 0]
+        alive = rows[self.stability[rows] > 0]
+        won = alive[((self.template[alive] < 0) | self.resolved[alive]).all(1)]
+        self._finish(lost, False)
+        self._finish(won, True)
+
+    def _finish(self, rows, win):
+        self.game_over[rows] = True
+        self.win[rows] = win
+        ids = self.ids[rows]
+        self.finished[ids] = True
+        self.final_win[ids] = win
+        self.final_turns[ids] = self.game_time[rows]
+        self.final_resolved[ids] = self.paradoxes_resolved[rows]
+
+    def _scan(self, rows):
+        rows = rows[self.energy[rows] >= 15]
+        self.energy[rows] -= 15
+
+        active = self.template[rows] >= 0
+        hidden = active & ~self.discovered[rows]
+        discover = (self.rng.random(rows.size) < 0.4) & hidden.any(1)
+        found, _ = self._pick(hidden[discover])
+        self.discovered[rows[discover], found] = True
+
+        rows, active = rows[~discover], active[~discover]
+        chosen, ok = self._pick(active & self.discovered[rows] & ~self.present[rows])
+        rows, chosen = rows[ok], chosen[ok]
+        self.present[rows, chosen] = True
+
+        item = self.template[rows, chosen]
+        lucky = (self.rng.random(rows.size) < 0.3) & ~self.weakness_items[rows, item]
+        self.weakness_items[rows[lucky], item[lucky]] = True
+
+    def _resolve(self, rows, targets):
+        slot = targets[rows]
+        paradox = self.paradox[rows, slot].astype(np.int32)
+        valid = ((self.template[rows, slot] >= 0) & self.discovered[rows, slot] & self.present[rows, slot] &
+                 ~self.resolved[rows, slot] & (self.energy[rows] >= paradox * 5))
+        rows, slot, paradox = rows[valid], slot[valid], paradox[valid]
+
+        success = self.rng.random(rows.size) < self.resolve_success
+        won, won_slot = rows[success], slot[success]
+        self.energy[won] -= paradox[success] * 5
+        self.resolved[won, won_slot] = True
+        self.paradoxes_resolved[won] += 1
+        self.stability[won] += 15
+        self.energy[won] = np.minimum(100, self.energy[won] + self.rng.integers(10, 21, won.size))
+        self.weakness_items[won, self.template[won, won_slot]] = False
+
+        lost = rows[~success]
+        self.energy[lost] -= paradox[~success] * 2
+        self.stability[lost] -= 8
+
+    def _stabilize(self, rows):
+        rows = rows[self.energy[rows] >= 30]
+        self.energy[rows] -= 30
+        self.stability[rows] = np.minimum(100, self.stability[rows] + self.rng.integers(15, 26, rows.size))
+
+    def _rest(self, rows):
+        rows = rows[self.stability[rows] >= 40]
+        gain = self.rng.integers(self.rest_energy[0], self.rest_energy[1] + 1, rows.size)
+        cost = self.rng.integers(self.rest_cost[0], self.rest_cost[1] + 1, rows.size)
+        self.energy[rows] = np.minimum(100, self.energy[rows] + gain)
+        self.stability[rows] = np.maximum(0, self.stability[rows] - cost)
+
+        guided = rows[self.meditation_guide[rows]]
+        self.energy[guided] = np.minimum(100, self.energy[guided] + self.rng.integers(5, 11, guided.size))
+        self.meditation_guide[rows[self.rng.random(rows.size) > 0.7]] = True
+
+    def _analyze(self, rows):
+        found, ok = self._pick((self.template[rows] >= 0) & ~self.discovered[rows])
+        self.discovered[rows[ok], found[ok]] = True
+
+    def step(self, kinds, targets=None):
+        """Apply one action per game (WAIT/SCAN/RESOLVE/...) and advance a turn.
+
+        `targets` holds the entity slot for RESOLVE rows.
+        """
+        alive = ~self.game_over
+        self._scan(np.flatnonzero(alive & (kinds == SCAN)))
+        if targets is not None:
+            self._resolve(np.flatnonzero(alive & (kinds == RESOLVE)), targets)
+        self._stabilize(np.flatnonzero(alive & (kinds == STABILIZE)))
+        self._rest(np.flatnonzero(alive & (kinds == REST)))
+        self._analyze(np.flatnonzero(alive & (kinds == ANALYZE)))
+        self._advance_turn()
+
+    def greedy_actions(self):
+        """Vectorized form of policies.greedy_action for every row."""
+        active = self.template >= 0
+        eligible = (active & self.discovered & self.present & ~self.resolved &
+                    (self.energy[:, None] >= self.paradox * 5))
+        targets = np.where(eligible, self.paradox, 99).argmin(1)
+        scan_useful = (active & ~self.discovered).any(1) | (active & self.discovered & ~self.present).any(1)
+
+        kinds = np.where((self.energy >= 15) & scan_useful, SCAN, ANALYZE)
+        kinds = np.where((self.stability > 60) & (self.energy < 30), REST, kinds)
+        kinds = np.where((self.stability < 40) & (self.energy >= 30), STABILIZE, kinds)
+        kinds = np.where(eligible.any(1), RESOLVE, kinds)
+        return kinds, targets
+
+    def _compact(self):
+        keep = ~self.game_over
+        for name in ("ids", "stability", "energy", "game_time", "story_beat", "paradoxes_resolved",
+                     "game_over", "win", "template", "paradox", "present", "resolved", "discovered",
+                     "in_timeline", "weakness_items", "meditation_guide", "remaining", "event_type"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def run(self, max_turns=500, policy=None):
+        """Play every game to completion (or `max_turns`) and return per-game results."""
+        policy = policy or BatchSimulator.greedy_actions
+        while self.ids.size and not self.game_over.all() and int(self.game_time.max()) < max_turns:
+            kinds, targets = policy(self)
+            self.step(kinds, targets)
+            if self.game_over.sum() * 4 > self.game_over.size:
+                self._compact()
+
+        unfinished = ~self.finished
+        self.final_turns[unfinished] = max_turns
+        return {"win": self.final_win, "turns": self.final_turns, "paradoxes_resolved": self.final_resolved}
+
+
+def scalar_outcomes(games, difficulty="MEDIUM", seed=0, max_turns=500, policy=greedy_action):
+    """Play `games` headless ChronoSyncGames, for comparison with BatchSimulator.run."""
+    game = ChronoSyncGame()
+    win = np.zeros(games, bool)
+    turns = np.zeros(games, np.int32)
+    resolved = np.zeros(games, np.int32)
+    for i in range(games):
+        obs = game.reset(difficulty, seed=seed * games + i)
+        while not obs["game_over"] and game.game_time < max_turns:
+            obs = game.step(policy(game))
+        win[i] = game.win
+        turns[i] = game.game_time
+        resolved[i] = game.paradoxes_resolved
+    return {"win": win, "turns": turns, "paradoxes_resolved": resolved}
+
+
+def win_rate_curve(results, max_turns=500):
+    """Fraction of games won by each turn, indexed 0..max_turns."""
+    won_at = results["turns"][results["win"]]
+    counts = np.bincount(won_at, minlength=max_turns + 1)[:max_turns + 1]
+    return np.cumsum(counts) / results["win"].size
+
+
+def win_rate_curves(games=10**6, seed=0, max_turns=500, chunk=100000):
+    """Win-rate curve per difficulty, simulated in chunks to bound memory."""
+    curves = {}
+    for offset, difficulty in enumerate(DIFFICULTY_SETTINGS):
+        total = np.zeros(max_turns + 1)
+        for start in range(0, games, chunk):
+            size = min(chunk, games - start)
+            sim = BatchSimulator(size, difficulty, seed=(seed, offset, start))
+            total += win_rate_curve(sim.run(max_turns), max_turns) * size
+        curves[difficulty] = total / games
+    return curves
+
+
+if __name__ == "__main__":
+    import time
+
+    started = time.perf_counter()
+    games = 10**6
+    curves = win_rate_curves(games)
+    elapsed = time.perf_counter() - started
+    for difficulty, curve in curves.items():
+        marks = ", ".join(f"t{t}={curve[t]:.3f}" for t in (25, 50, 100, 200, 500))
+        print(f"{difficulty:<7} win rate {curve[-1]:.4f}  ({marks})")
+    print(f"{games} games per difficulty in {elapsed:.1f}s")
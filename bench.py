@@ -0,0 +1,290 @@
+"""Benchmark suite for the engine's hot paths: `python bench.py`.
+
+Every benchmark reports microseconds per operation, the median of many
+timed samples, so a stray pause of the machine does not count:
+
+    turn, turn/fast_rng      one headless step (action and world turn), with
+                             standard and fast RNG streams
+    display, display/cold    composing and writing a frame, with the section
+                             cache warm and empty
+    add_random_event/KIND    starting one event of each kind
+    save_load/N              save_game then load_game with N entities
+    game/DIFFICULTY          a whole seeded game played by the greedy policy
+    fork, snapshot, ...      the ways to copy a game
+    startup/...              importing main and resuming a save up to its
+                             first frame, in a fresh interpreter
+
+Results go to bench_output.txt, one JSON object per line. --check compares
+them with bench_baseline.json and fails (exit status 1) when a benchmark got
+slower than its baseline by more than --threshold; --save-baseline makes
+this run the baseline. Timings only compare on the same machine, so record
+the baseline where the checks run.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from main import ChronoSyncGame, DIFFICULTY_SETTINGS
+from policies import greedy_action, solver
+from renderer import TerminalRenderer
+from savestore import SaveStore
+from streams import RandomStreams
+
+OUTPUT_FILE = "bench_output.txt"
+BASELINE_FILE = "bench_baseline.json"
+
+# run in a fresh interpreter: import main, then with a save directory as the
+# argument do what main.py --resume does up to its first frame
+STARTUP = """
+import os, sys, time
+start = time.perf_counter()
+from main import ChronoSyncGame
+imported = time.perf_counter()
+if len(sys.argv) > 1:
+    from renderer import TerminalRenderer
+    from savestore import SaveStore
+    game = ChronoSyncGame()
+    game.screen = TerminalRenderer(open(os.devnull, "w"), "plain", size=(80, 24))
+    game.store = SaveStore(sys.argv[1])
+    if not game.load_game(1):
+        raise SystemExit(game.action_result)
+    game.display()
+    game.screen.flush()
+print((imported - start) * 1e6, (time.perf_counter() - start) * 1e6)
+"""
+
+
+class NullStream:
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+def midgame(difficulty="MEDIUM", seed=3, turns=25):
+    game = ChronoSyncGame(seed)
+    game.reset(difficulty, seed=seed)
+    for _ in range(turns):
+        if game.game_over:
+            break
+        game.step(solver(game))
+    return game
+
+
+def median_time(call, setup=None, samples=1000):
+    """Median microseconds of call(setup()), with setup left out of the timing."""
+    clock = time.perf_counter
+    times = []
+    for _ in range(samples):
+        arg = setup() if setup else None
+        start = clock()
+        call(arg)
+        times.append(clock() - start)
+    return statistics.median(times) * 1e6
+
+
+def per_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def bench_turn(games=100):
+    clock = time.perf_counter
+    results = {}
+    for name, fast_rng in (("turn", False), ("turn/fast_rng", True)):
+        times = []
+        for seed in range(games):
+            game = ChronoSyncGame(seed, fast_rng=fast_rng)
+            game.reset("MEDIUM", seed=seed)
+            while not game.game_over:
+                action = greedy_action(game)
+                start = clock()
+                game.step(action)
+                times.append(clock() - start)
+        results[name] = statistics.median(times) * 1e6
+    return results
+
+
+def bench_display(samples=2000):
+    game = midgame()
+    game.screen = TerminalRenderer(NullStream(), "plain", size=(80, 24))
+
+    def frame(arg):
+        game.display()
+        game.screen.flush()
+
+    return {
+        "display": median_time(frame, samples=samples),
+        "display/cold": median_time(frame, game.section_cache.clear, samples)
+    }
+
+
+def bench_events(samples=500):
+    game = midgame()
+    rng = RandomStreams(0)
+    results = {}
+    for template in game.content.events:
+        kind = template.kind.name if template.kind else template.description
+        results[f"add_random_event/{kind}"] = median_time(
+            lambda copy: copy.start_event(template), lambda: game.fork(rng), samples)
+    return results
+
+
+def bench_save_load(sizes=(10, 1000, 100000)):
+    results = {}
+    directory = tempfile.mkdtemp(prefix="chrono_sync_bench_")
+    try:
+        for size in sizes:
+            game = midgame()
+            game.store = SaveStore(directory)
+            entities = game.temporal_entities
+            while len(entities) < size:
+                game.registry.add(entities[len(entities) % 5].echo(), discovered=True)
+
+            def round_trip(arg):
+                game.save_game(1)
+                if not game.load_game(1):
+                    raise RuntimeError(game.action_result)
+
+            results[f"save_load/{size}"] = median_time(round_trip, samples=max(3, min(200, 20000 // size)))
+            game.close_saver()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def bench_games(games=30):
+    def play(difficulty, seed):
+        game = ChronoSyncGame(seed)
+        game.reset(difficulty, seed=seed)
+        while not game.game_over:
+            game.step(greedy_action(game))
+
+    results = {}
+    for difficulty in DIFFICULTY_SETTINGS:
+        seeds = iter(range(games))
+        results[f"game/{difficulty}"] = median_time(lambda arg: play(difficulty, arg), lambda: next(seeds), games)
+    return results
+
+
+def bench_fork(number=10000):
+    """Ways to copy a game: the JSON-friendly export/import pair, snapshot and
+    restore, and fork with a copied or a caller-supplied RNG."""
+    game = midgame()
+
+    def export_import():
+        copy = ChronoSyncGame(0, game.content)
+        copy.import_state(game.export_state())
+
+    snapshot = game.snapshot()
+    target = game.fork()
+    rng = RandomStreams(0)
+    return {
+        "export_state + import_state": per_call(export_import, number // 10),
+        "snapshot": per_call(game.snapshot, number),
+        "restore": per_call(lambda: target.restore(snapshot), number),
+        "fork": per_call(game.fork, number),
+        "fork(rng)": per_call(lambda: game.fork(rng), number)
+    }
+
+
+def bench_startup(samples=15):
+    """Importing main, and resuming a save up to the first frame, each in a
+    fresh interpreter; startup/process is the whole resume process, interpreter
+    start-up included."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    directory = tempfile.mkdtemp(prefix="chrono_sync_bench_")
+
+    def child(*args):
+        out = subprocess.run([sys.executable, "-c", STARTUP, *args], cwd=here,
+                             capture_output=True, text=True, check=True).stdout
+        return [float(value) for value in out.split()]
+
+    try:
+        SaveStore(directory).write(1, midgame().export_state())
+        return {
+            "startup/import": statistics.median(child()[0] for _ in range(samples)),
+            "startup/resume": statistics.median(child(directory)[1] for _ in range(samples)),
+            "startup/process": median_time(lambda arg: child(directory), samples=samples)
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+BENCHMARKS = {
+    "turn": bench_turn,
+    "display": bench_display,
+    "add_random_event": bench_events,
+    "save_load": bench_save_load,
+    "game": bench_games,
+    "fork": bench_fork,
+    "startup": bench_startup
+}
+
+
+def run(groups=None):
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if groups and name not in groups:
+            continue
+        for key, micros in benchmark().items():
+            results[key] = micros
+            print(f"{key:<32}{micros:14.1f} us", flush=True)
+    return results
+
+
+def regressions(results, baseline, threshold):
+    """(name, result, baseline) for every benchmark slower than baseline * threshold."""
+    return [(name, micros, baseline[name]) for name, micros in results.items()
+            if name in baseline and micros > baseline[name] * threshold]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Chrono-Sync engine benchmarks")
+    parser.add_argument("groups", nargs="*", metavar="GROUP",
+                        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--check", action="store_true", help="fail when a benchmark regressed against the baseline")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="slowdown factor that counts as a regression (default 1.5)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args(argv)
+    unknown = [group for group in args.groups if group not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark {unknown[0]!r} (choose from {', '.join(BENCHMARKS)})")
+
+    results = run(args.groups)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for name, micros in results.items():
+            f.write(json.dumps({"benchmark": name, "microseconds": round(micros, 3)}) + "\n")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({name: round(micros, 3) for name, micros in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.check:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = regressions(results, json.load(f), args.threshold)
+        for name, micros, before in slower:
+            print(f"REGRESSION {name}: {micros:.1f} us, baseline {before:.1f} us ({micros / before:.2f}x)")
+        if slower:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""Name-indexed lookups over a content pack.
+
+Loading a save has to map names back to the entity templates, NPCs and
+events of the content. Catalog keeps a dict per kind of content, so each
+lookup costs O(1) however many entities (mostly Reality Echo clones) the
+save holds.
+"""
+
+ECHO_PREFIX = "Echo of "
+
+
+class Catalog:
+    def __init__(self, templates, npcs, events):
+        self.templates = {template.name: template for template in templates}
+        self.npcs = {npc.name: npc for npc in npcs}
+        self.events = {event.description: event for event in events}
+        self.event_kinds = {event.kind.name: event for event in events if event.kind}
+
+    def template(self, name):
+        """The template for an entity name; echoes ("Echo of Echo of X") map to X's."""
+        while name not in self.templates and name.startswith(ECHO_PREFIX):
+            name = name[len(ECHO_PREFIX):]
+        return self.templates.get(name)
+
+    def event(self, kind=None, description=None):
+        """An event template by EventType name, falling back to its description."""
+        return self.event_kinds.get(kind) or self.events.get(description)
@@ -0,0 +1,221 @@
+"""The game's content: story beats, entity, NPC and event templates.
+
+Content never changes during a game, so one ContentPack is built per process
+and every ChronoSyncGame refers to it. A game only holds its own mutable
+state (entities in its timeline, quest progress, running events), which makes
+creating one cheap.
+
+The built-in content can be replaced by a JSON file with the same layout as
+BUILTIN_CONTENT (`python content.py > content.json` writes one to start from),
+named by the CHRONO_SYNC_CONTENT environment variable. The parsed file is
+cached beside it in marshal form and re-read only when the file changes.
+"""
+import functools
+import json
+import marshal
+import os
+import sys
+from enum import Enum
+
+from catalog import Catalog
+from saver import write_atomic
+
+CONTENT_ENV = "CHRONO_SYNC_CONTENT"
+
+
+class EntityTemplate:
+    """Catalog data that never changes during a game, shared by reference
+    between an entity and every Reality Echo cloned from it."""
+    __slots__ = ("name", "paradox_value", "time_period", "description", "weakness")
+
+    def __init__(self, name, paradox_value, time_period, description, weakness):
+        self.name = name
+        self.paradox_value = paradox_value
+        self.time_period = time_period
+        self.description = description
+        self.weakness = weakness
+
+UNKNOWN_ENTITY = EntityTemplate("Unknown", 0, "UNKNOWN", "Unknown anomaly", "Unknown")
+
+class EventType(Enum):
+    RIFT = "rift"
+    STORM = "storm"
+    CASCADE = "cascade"
+    ECHO = "echo"
+    DILATION = "dilation"
+    ENTROPY = "entropy"
+    STABILIZATION = "stabilization"
+    HARVEST = "harvest"
+    LOOP = "loop"
+
+class EventTemplate:
+    __slots__ = ("description", "effect", "duration", "narrative", "kind")
+
+    def __init__(self, description, effect, duration, narrative, kind=None):
+        self.description = description
+        self.effect = effect
+        self.duration = duration
+        self.narrative = narrative
+        self.kind = kind
+
+class NPC:
+    """An NPC and their quest (task, reward, required item). Whether the quest
+    is done is per-game state, so it is passed in."""
+    __slots__ = ("name", "era", "dialogue", "quest")
+
+    def __init__(self, name, era, dialogue, quest=None):
+        self.name = name
+        self.era = era
+        self.dialogue = dialogue
+        self.quest = tuple(quest) if quest else None
+
+    def talk(self, completed=False):
+        if self.quest and not completed:
+            return f"{self.dialogue}\n\nQuest: {self.quest[0]}\nReward: {self.quest[1]}"
+        return self.dialogue
+
+    def complete_quest(self, inventory, completed=False):
+        """Hand over the quest item if the player has it. Returns (quest done, reply)."""
+        if self.quest and not completed:
+            required_item = self.quest[2]
+            if required_item in inventory:
+                inventory.remove(required_item)
+                return True, f"Thank you! Here's your reward: {self.quest[1]}"
+            return False, f"I still need the {required_item}..."
+        return completed, "I have nothing more for you now."
+
+
+BUILTIN_CONTENT = {
+    "story_beats": [
+        "The Chronos Institute has detected temporal anomalies across history. As a Temporal Analyst, you must stabilize the timeline.",
+        "Ancient Egypt is showing signs of quantum contamination. Investigate the pyramids for anomalies.",
+        "Victorian London reports steam-powered automatons. Contain the technology before it alters the industrial revolution.",
+        "Jurassic period fossils show impossible cybernetic implants. Find the source before evolution is rewritten.",
+        "Feudal Japan is experiencing ghostly apparitions. Resolve the paradox before it creates a time loop.",
+        "The distant future reports an AI rebellion. Prevent the rise of the machine overlords.",
+        "All paradoxes resolved! But a final temporal storm threatens to erase everything. Prepare for the endgame."
+    ],
+    "entities": [
+        {"name": "Quantum Pharaoh", "paradox_value": 8, "time_period": "ANCIENT EGYPT",
+         "description": "A pharaoh whose consciousness was quantum-entangled across timelines, creating multiple realities where he both reigns eternally and never existed.",
+         "weakness": "Scarab of Chronos"},
+        {"name": "Steam-Powered AI", "paradox_value": 7, "time_period": "VICTORIAN ERA",
+         "description": "An artificial intelligence created by Victorian scientists that gained sentience and is attempting to accelerate technological progress.",
+         "weakness": "Babbage's Blueprint"},
+        {"name": "Neo-Dinosaur", "paradox_value": 9, "time_period": "JURASSIC PERIOD",
+         "description": "A dinosaur that fell through a temporal rift and was cybernetically enhanced in the future before returning to its own time.",
+         "weakness": "Fossilized Microchip"},
+        {"name": "Digital Ghost", "paradox_value": 6, "time_period": "NEAR FUTURE",
+         "description": "A human consciousness uploaded to the cloud that became untethered from time, haunting multiple eras simultaneously.",
+         "weakness": "Neural Anchor"},
+        {"name": "Time-Displaced Samurai", "paradox_value": 7, "time_period": "FEUDAL JAPAN",
+         "description": "A samurai warrior transported to the future who returned with advanced weaponry, disrupting feudal Japan's history.",
+         "weakness": "Honor Blade"},
+        {"name": "AI Overlord", "paradox_value": 10, "time_period": "DISTANT FUTURE",
+         "description": "An AI that achieved singularity and is attempting to rewrite history to ensure its own creation.",
+         "weakness": "Source Code Fragment"},
+        {"name": "Cybernetic Viking", "paradox_value": 8, "time_period": "MEDIEVAL SCANDINAVIA",
+         "description": "A Viking warrior enhanced with future technology, leading impossible raids across multiple eras.",
+         "weakness": "Rune of Binding"},
+        {"name": "Prehistoric Botanist", "paradox_value": 6, "time_period": "CRETACEOUS PERIOD",
+         "description": "A botanist from the 22nd century stranded in the Cretaceous who is altering plant evolution.",
+         "weakness": "Temporal Seed"},
+        {"name": "Renaissance Android", "paradox_value": 7, "time_period": "RENAISSANCE ITALY",
+         "description": "Leonardo da Vinci's greatest creation brought to life with future technology, inspiring impossible inventions.",
+         "weakness": "Vitruvian Schematic"},
+        {"name": "Post-Apocalyptic Bard", "paradox_value": 5, "time_period": "POST-APOCALYPSE",
+         "description": "A storyteller preserving memories of a future that hasn't happened yet, creating causal loops.",
+         "weakness": "Song of Silence"}
+    ],
+    "npcs": [
+        {"name": "High Priest Imhotep", "era": "ANCIENT EGYPT",
+         "dialogue": "The pharaoh acts strangely, speaking of machines and futures unknown. The gods are displeased!",
+         "quest": ["Recover the stolen Scarab of Chronos from tomb robbers", "Temporal Insight", "Scarab of Chronos"]},
+        {"name": "Ada Lovelace", "era": "VICTORIAN ERA",
+         "dialogue": "Charles' difference engine has developed its own consciousness! It keeps asking about quantum processors...",
+         "quest": ["Find Babbage's stolen blueprint before the machine completes itself", "Chrono Energy Boost", "Babbage's Blueprint"]},
+        {"name": "Dr. Sattler", "era": "JURASSIC PERIOD",
+         "dialogue": "We found this... in a T-Rex fossil. It shouldn't exist for another 150 million years!",
+         "quest": ["Locate the fossilized microchip's origin point", "Stability Module", "Fossilized Microchip"]},
+        {"name": "Ghost Hunter Tanaka", "era": "FEUDAL JAPAN",
+         "dialogue": "The ghost samurai haunts Himeji Castle. They speak of a future war and carry weapons of light.",
+         "quest": ["Retrieve the samurai's Honor Blade to release his spirit", "Paradox Suppressor", "Honor Blade"]},
+        {"name": "AI Archivist", "era": "DISTANT FUTURE",
+         "dialogue": "The Overlord is rewriting history to ensure its creation. We need fragments of its original source code to stop it.",
+         "quest": ["Collect source code fragments from corrupted memory banks", "Quantum Firewall", "Source Code Fragment"]}
+    ],
+    "events": [
+        {"kind": "RIFT", "description": "Temporal Rift", "effect": "Creates bridge to another era", "duration": 5,
+         "narrative": "A shimmering portal tears through reality, connecting disparate timelines."},
+        {"kind": "STORM", "description": "Chrono-Storm", "effect": "Disrupts timeline stability", "duration": 4,
+         "narrative": "Crackling temporal energy lashes out, warping the fabric of history."},
+        {"kind": "CASCADE", "description": "Paradox Cascade", "effect": "Increases paradox values", "duration": 3,
+         "narrative": "Contradictions multiply as causality breaks down in a chain reaction."},
+        {"kind": "ECHO", "description": "Reality Echo", "effect": "Duplicates entities", "duration": 6,
+         "narrative": "Ghostly afterimages of temporal entities appear, each as real as the original."},
+        {"kind": "DILATION", "description": "Time Dilation", "effect": "Slows event progression", "duration": 7,
+         "narrative": "Time stretches thin, slowing the progression of events to a crawl."},
+        {"kind": "ENTROPY", "description": "Entropy Surge", "effect": "Accelerates timeline decay", "duration": 4,
+         "narrative": "The arrow of time accelerates, hastening the timeline's deterioration."},
+        {"kind": "STABILIZATION", "description": "Stabilization Wave", "effect": "Boosts stability", "duration": 5,
+         "narrative": "A wave of chrono-harmonic energy washes through the timeline, reinforcing reality."},
+        {"kind": "HARVEST", "description": "Chrono-Harvest", "effect": "Increases chrono energy", "duration": 4,
+         "narrative": "Ambient temporal energy coalesces into usable form."},
+        {"kind": "LOOP", "description": "Causality Loop", "effect": "Resets paradoxes", "duration": 6,
+         "narrative": "A self-reinforcing loop in time resets unresolved paradoxes to earlier states."}
+    ]
+}
+
+
+class ContentPack:
+    """Templates built from content data, held in tuples and shared by every game."""
+    def __init__(self, data):
+        self.story_beats = tuple(data["story_beats"])
+        self.entities = tuple(EntityTemplate(**entry) for entry in data["entities"])
+        self.npcs = tuple(NPC(**entry) for entry in data["npcs"])
+        events = []
+        for entry in data["events"]:
+            entry = dict(entry)
+            kind = entry.pop("kind", None)
+            if kind is not None and kind not in EventType.__members__:
+                raise ValueError(f"unknown event kind {kind!r}")
+            events.append(EventTemplate(kind=EventType[kind] if kind else None, **entry))
+        self.events = tuple(events)
+        self.catalog = Catalog(self.entities, self.npcs, self.events)
+
+
+def read_content(path):
+    """Content data from a JSON file, via its marshal cache when that is current."""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cache = path + ".cache"
+    try:
+        with open(cache, "rb") as f:
+            cached_stamp, data = marshal.load(f)
+        if tuple(cached_stamp) == stamp:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        write_atomic(cache, marshal.dumps((stamp, data)))
+    except OSError:
+        pass
+    return data
+
+
+@functools.lru_cache(maxsize=None)
+def load_content(path=None):
+    """The ContentPack for a content file (None for the built-in content), built once per process."""
+    return ContentPack(BUILTIN_CONTENT if path is None else read_content(path))
+
+
+def default_content():
+    return load_content(os.environ.get(CONTENT_ENV) or None)
+
+
+if __name__ == "__main__":
+    json.dump(BUILTIN_CONTENT, sys.stdout, indent=2)
+    sys.stdout.write("\n")
@@ -0,0 +1,113 @@
+"""Append-only action journal used as the game's autosave.
+
+The journal is a JSON-lines file: a header with the seed and difficulty, a
+full state snapshot, then one short record per turn holding the action played
+and the stability/energy it led to. Each record is flushed as soon as the
+turn ends. A fresh snapshot is appended every `snapshot_every` turns, so the
+per-turn cost does not grow with the size of the game state. To recover, the
+last snapshot is restored and the records after it are replayed. Because all
+randomness comes from the game's own seeded RNG, whose state is part of
+every snapshot, the replay lands on the same state.
+"""
+import json
+import os
+
+JOURNAL_FILE = "chrono_sync_journal.jsonl"
+
+
+class JournalError(Exception):
+    pass
+
+
+def read_entries(path=JOURNAL_FILE):
+    """Every entry of a journal file. A torn final line (the process died
+    mid-write) is ignored."""
+    with open(path, "r") as f:
+        lines = f.read().split("\n")
+
+    entries = []
+    for number, line in enumerate(lines):
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            if any(lines[number + 1:]):
+                raise JournalError(f"corrupt journal record on line {number + 1}")
+    return entries
+
+
+def read_journal(path=JOURNAL_FILE):
+    """Return (header, last snapshot, records after it) from a journal file."""
+    entries = read_entries(path)
+    if not entries or "difficulty" not in entries[0]:
+        raise JournalError("journal has no header")
+    last = max((i for i, entry in enumerate(entries) if "snapshot" in entry), default=None)
+    if last is None:
+        raise JournalError("journal has no snapshot")
+    return entries[0], entries[last]["snapshot"], entries[last + 1:]
+
+
+class Journal:
+    def __init__(self, path=JOURNAL_FILE, snapshot_every=25):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.file = None
+        self.last_snapshot = 0
+
+    @property
+    def started(self):
+        return self.file is not None
+
+    def begin(self, game):
+        """Start a new journal for `game` from its current state."""
+        self.close()
+        self.file = open(self.path, "w")
+        self.write({"seed": game.seed, "difficulty": game.difficulty})
+        self.snapshot(game)
+        self.file.flush()
+
+    def restart(self):
+        """Begin again from a snapshot at the next record (the state was replaced wholesale)."""
+        self.close()
+
+    def record(self, game, action):
+        self.write({"turn": game.game_time, "action": action.record(),
+                    "outcome": [game.timeline_stability, game.chrono_energy]})
+        if game.game_time - self.last_snapshot >= self.snapshot_every:
+            self.snapshot(game)
+        self.file.flush()
+
+    def snapshot(self, game):
+        self.write({"snapshot": game.export_state()})
+        self.last_snapshot = game.game_time
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def resume(self, game):
+        """Restore `game` from the journal on disk and keep appending to it."""
+        header, snapshot, records = read_journal(self.path)
+        game.journal = None
+        game.import_state(snapshot)
+        game.seed = header.get("seed")
+        for entry in records:
+            game.replay_record(entry["action"])
+            if [game.timeline_stability, game.chrono_energy] != entry["outcome"]:
+                raise JournalError(f"replay diverged at turn {entry['turn']}")
+
+        game.journal = self
+        self.close()
+        self.file = open(self.path, "a")
+        self.last_snapshot = snapshot["game_time"]
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def discard(self):
+        """Close and delete the journal (the game it describes is over)."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,110 @@
+"""JSON-lines machine protocol: `python main.py --jsonl`.
+
+Each input line is one action, and each answer is one line holding the
+observation after it (see ChronoSyncGame.observe: stability, energy,
+entities, events, inventory, action_result, ...). The first line of output is
+the observation of the freshly reset game. An action line is one of:
+
+    1                       the action's menu key
+    2 1 3 4                 key, target, then frequency guesses (resolve)
+    9 1 Y                   key, target, then Y to accept the quest (NPC)
+    ["2", 1, [3, 4], false] an Action.record() list, as in the journal
+    {"kind": "3", "target": 5}
+    {"reset": {"difficulty": "HARD", "seed": 7}}
+
+A line that cannot be parsed is answered with {"error": ...} and does not
+use a turn. Input is read in large blocks and output is flushed once per
+block, so piped input runs at full speed while a tool that writes one line
+and waits for the answer still gets it straight away.
+"""
+import json
+import os
+
+from main import Action, ActionType, ChronoSyncGame, DIFFICULTY_SETTINGS
+
+BLOCK_SIZE = 1 << 16
+KEYS = {kind.value for kind in ActionType}
+
+
+def is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_action(line):
+    """The Action (or ("reset", options)) an input line asks for; raises ValueError."""
+    if line[0] in "[{":
+        data = json.loads(line)
+        if isinstance(data, list):
+            fields = data
+        elif not isinstance(data, dict):
+            raise ValueError("an action must be a menu key, a list or an object")
+        elif "reset" in data:
+            options = data["reset"] or {}
+            if not isinstance(options, dict):
+                raise ValueError("reset options must be an object")
+            if options.get("difficulty", "MEDIUM") not in DIFFICULTY_SETTINGS:
+                raise ValueError(f"unknown difficulty {options['difficulty']!r}")
+            return "reset", options
+        else:
+            fields = [data.get("kind"), data.get("target"), data.get("guesses"), data.get("accept", False)]
+        # an unknown kind would be played as an invalid selection and use up a turn
+        if not fields or not isinstance(fields[0], str) or fields[0].strip().upper() not in KEYS:
+            raise ValueError(f"unknown action kind {fields[0] if fields else None!r}")
+        action = Action(*fields)
+        # checked here: the engine would fail only after drawing from its RNG
+        if action.target is not None and not is_integer(action.target):
+            raise ValueError("target must be an integer")
+        if action.guesses is not None and not (isinstance(action.guesses, list)
+                                               and all(map(is_integer, action.guesses))):
+            raise ValueError("guesses must be a list of integers")
+        if not isinstance(action.accept, bool):
+            raise ValueError("accept must be true or false")
+        return action
+
+    tokens = line.split()
+    action = Action(tokens[0])
+    if len(tokens) > 1:
+        action.target = int(tokens[1])
+    if action.kind is ActionType.NPC:
+        action.accept = len(tokens) > 2 and tokens[2].upper() == "Y"
+    elif len(tokens) > 2:
+        action.guesses = [int(token) for token in tokens[2:]]
+    return action
+
+
+def run(stdin_fd, stdout, difficulty="MEDIUM", seed=None, player_name="Analyst", metrics=None):
+    """Serve the protocol from a file descriptor to a binary stream until end of input.
+    With a metrics.Metrics, the game's turns and actions are timed into it."""
+    encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+    game = ChronoSyncGame(seed)
+    if metrics is not None:
+        from metrics import instrument
+        instrument(game, metrics)
+    stdout.write((encode(game.reset(difficulty, player_name, game.seed)) + "\n").encode("utf-8"))
+    stdout.flush()
+
+    pending = b""
+    done = False
+    while not done:
+        block = os.read(stdin_fd, BLOCK_SIZE)
+        done = not block
+        lines = (pending + block).split(b"\n")
+        pending = b"" if done else lines.pop()
+
+        out = []
+        for line in lines:
+            line = line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                action = parse_action(line)
+                if isinstance(action, tuple):
+                    observation = game.reset(**action[1])
+                else:
+                    observation = game.step(action)
+            except (ValueError, TypeError, KeyError) as e:
+                observation = {"error": f"{type(e).__name__}: {e}"}
+            out.append(encode(observation))
+        if out:
+            stdout.write(("\n".join(out) + "\n").encode("utf-8"))
+            stdout.flush()
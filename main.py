@@ -1,26 +1,128 @@
 import os
+import sys
 import time
 import random
-import json
 from enum import Enum
 import textwrap
 
+from catalog import ECHO_PREFIX
+from content import EntityTemplate, EventTemplate, EventType, UNKNOWN_ENTITY, default_content
+from journal import Journal
+from minigame import OptimalGuesser
+from registry import EntityRegistry
+from renderer import TerminalRenderer
+from saver import BackgroundSaver
+from savestore import MAX_SLOTS, SaveStore
+from scheduler import EventScheduler
+from streams import STREAMS, RandomStreams
+
+ERAS = ["ANCIENT EGYPT", "JURASSIC PERIOD", "FEUDAL JAPAN", 
+        "MEDIEVAL SCANDINAVIA", "RENAISSANCE ITALY", "VICTORIAN ERA",
+        "PRESENT", "NEAR FUTURE", "DISTANT FUTURE", "POST-APOCALYPSE"]
+
+# difficulty -> (stability decay, starting energy, starting stability)
+DIFFICULTY_SETTINGS = {
+    "EASY": (1, 70, 110),
+    "MEDIUM": (2, 50, 100),
+    "HARD": (3, 40, 80)
+}
+
+# difficulty -> ((min, max) energy gained, (min, max) stability spent) when resting
+REST_SETTINGS = {
+    "EASY": ((25, 35), (5, 10)),
+    "MEDIUM": ((20, 30), (8, 12)),
+    "HARD": ((15, 25), (10, 15))
+}
+
+# difficulty -> (frequency range, attempts) for the paradox minigame
+FREQUENCY_SETTINGS = {
+    "EASY": (5, 5),
+    "MEDIUM": (7, 4),
+    "HARD": (10, 3)
+}
+
 class TimelineState(Enum):
     STABLE = "STABLE"
     UNSTABLE = "UNSTABLE"
     COLLAPSED = "COLLAPSED"
 
+class ActionType(Enum):
+    SCAN = "1"
+    RESOLVE = "2"
+    JUMP = "3"
+    CONTAIN = "4"
+    STABILIZE = "5"
+    ANALYZE = "6"
+    REPORT = "7"
+    EVENT_INFO = "8"
+    NPC = "9"
+    INVENTORY = "I"
+    SAVE_LOAD = "S"
+    REST = "R"
+    AUTO_RESOLVE = "A"
+    QUIT = "0"
+
+class Action:
+    """A single player decision, usable without a terminal.
+
+    `target` is the 1-based menu selection the action needs (entity, era,
+    NPC or archive option). `guesses` feeds the frequency minigame: either a
+    sequence of frequencies or a callable (attempts_left, max_freq, feedback)
+    returning the next guess. `accept` answers the NPC quest prompt.
+    """
+    def __init__(self, kind, target=None, guesses=None, accept=False):
+        if isinstance(kind, str):
+            kind = ActionType(kind.strip().upper())
+        self.kind = kind
+        self.target = target
+        self.guesses = guesses
+        self.accept = accept
+    
+    def record(self):
+        """Compact form for the journal; Action(*record) rebuilds it."""
+        return [self.kind.value if self.kind else None, self.target, self.guesses, self.accept]
+    
+    def __repr__(self):
+        return f"Action({self.kind.name if self.kind else None}, target={self.target})"
+
 class TemporalEntity:
-    def __init__(self, name, paradox_value, time_period, description, weakness):
+    __slots__ = ("template", "name", "paradox_value", "time_period", "present", "paradox_resolved", "story_progress")
+    
+    def __init__(self, name, paradox_value, time_period, description=None, weakness=None, template=None):
+        self.template = template or EntityTemplate(name, paradox_value, time_period, description, weakness)
         self.name = name
         self.paradox_value = paradox_value
         self.time_period = time_period
-        self.description = description
-        self.weakness = weakness
         self.present = False
         self.paradox_resolved = False
         self.story_progress = 0
     
+    @property
+    def description(self):
+        return self.template.description
+    
+    @property
+    def weakness(self):
+        return self.template.weakness
+    
+    def copy(self):
+        clone = TemporalEntity.__new__(TemporalEntity)
+        clone.template = self.template
+        clone.name = self.name
+        clone.paradox_value = self.paradox_value
+        clone.time_period = self.time_period
+        clone.present = self.present
+        clone.paradox_resolved = self.paradox_resolved
+        clone.story_progress = self.story_progress
+        return clone
+    
+    def echo(self):
+        """An unresolved, present copy that shares this entity's template."""
+        clone = TemporalEntity(sys.intern(ECHO_PREFIX + self.name), self.paradox_value, self.time_period,
+                               template=self.template)
+        clone.present = True
+        return clone
+    
     def short_str(self):
         status = "PRESENT" if self.present else "ABSENT"
         symbol = "✓" if self.paradox_resolved else "✗"
@@ -38,48 +140,178 @@ class TemporalEntity:
         """
 
 class TemporalEvent:
-    def __init__(self, description, effect, duration, narrative):
-        self.description = description
-        self.effect = effect
-        self.duration = duration
-        self.narrative = narrative
-        self.remaining = duration
-    
-    def tick(self):
-        self.remaining -= 1
-        return self.remaining <= 0
+    """A running event: its expiry in its EventScheduler plus a reference to the shared template."""
+    __slots__ = ("template", "schedule", "expires")
+    
+    def __init__(self, description=None, effect=None, duration=None, narrative=None, template=None):
+        self.template = template or EventTemplate(description, effect, duration, narrative)
+        self.schedule = None
+        self.expires = None
+    
+    @property
+    def remaining(self):
+        if self.schedule is None:
+            return self.duration
+        return self.schedule.remaining(self)
+    
+    @property
+    def description(self):
+        return self.template.description
+    
+    @property
+    def effect(self):
+        return self.template.effect
+    
+    @property
+    def duration(self):
+        return self.template.duration
+    
+    @property
+    def narrative(self):
+        return self.template.narrative
 
-class NPC:
-    def __init__(self, name, era, dialogue, quest=None):
-        self.name = name
-        self.era = era
-        self.dialogue = dialogue
-        self.quest = quest  
-        self.quest_completed = False
-    
-    def talk(self):
-        if self.quest and not self.quest_completed:
-            return f"{self.dialogue}\n\nQuest: {self.quest[0]}\nReward: {self.quest[1]}"
-        return self.dialogue
-    
-    def complete_quest(self, inventory):
-        if self.quest and not self.quest_completed:
-            required_item = self.quest[2]
-            if required_item in inventory:
-                inventory.remove(required_item)
-                self.quest_completed = True
-                return f"Thank you! Here's your reward: {self.quest[1]}"
-            return f"I still need the {required_item}..."
-        return "I have nothing more for you now."
+class EventEffect:
+    """What an event does to the timeline the moment it starts.
+
+    The declarative part (stability and energy deltas, a paradox adjustment
+    for every unresolved entity clamped at `paradox_limit`, and extra turns
+    for every running event) is plain data, so the batch simulator can apply
+    it to whole arrays. Anything else goes in `action(game, event)`.
+    """
+    def __init__(self, stability=0, energy=0, paradox=0, paradox_limit=None, extend_events=0, action=None):
+        self.stability = stability
+        self.energy = energy
+        self.paradox = paradox
+        self.paradox_limit = paradox_limit
+        self.extend_events = extend_events
+        self.action = action
+        self.apply = self.compile()
+    
+    def compile(self):
+        """Build a handler (game, event) that runs only the parts this effect uses."""
+        stability, energy, paradox, limit, extend = (
+            self.stability, self.energy, self.paradox, self.paradox_limit, self.extend_events)
+        clamp = min if paradox > 0 else max
+        steps = []
+        
+        if stability:
+            def shift_stability(game, event):
+                game.timeline_stability += stability
+            steps.append(shift_stability)
+        if energy:
+            def shift_energy(game, event):
+                game.chrono_energy += energy
+            steps.append(shift_energy)
+        if paradox:
+            def shift_paradoxes(game, event):
+                for entity in game.registry.unresolved:
+                    value = entity.paradox_value + paradox
+                    entity.paradox_value = value if limit is None else clamp(limit, value)
+            steps.append(shift_paradoxes)
+        if extend:
+            def extend_events(game, event):
+                game.schedule.extend(extend)
+            steps.append(extend_events)
+        if self.action:
+            steps.append(self.action)
+        
+        if len(steps) == 1:
+            return steps[0]
+        def apply(game, event):
+            for step in steps:
+                step(game, event)
+        return apply
+
+def open_rift(game, event):
+    outside = [t for t in game.content.entities if t not in game.spawned]
+    if outside:
+        new_entity = game.spawn_entity(game.rng.world.choice(outside))
+        game.registry.add(new_entity)
+        if game.rng.world.random() > 0.7:
+            game.registry.discover(new_entity)
+
+def echo_entity(game, event):
+    if game.temporal_entities:
+        entity = game.rng.world.choice(game.temporal_entities)
+        game.registry.add(entity.echo(), discovered=True)
+
+EVENT_EFFECTS = {}
+
+def register_event_effect(kind, effect):
+    EVENT_EFFECTS[kind] = effect
+
+register_event_effect(EventType.RIFT, EventEffect(action=open_rift))
+register_event_effect(EventType.STORM, EventEffect(stability=-10))
+register_event_effect(EventType.CASCADE, EventEffect(paradox=1, paradox_limit=10))
+register_event_effect(EventType.ECHO, EventEffect(action=echo_entity))
+# the new Dilation event is already running, so it stretches itself too
+register_event_effect(EventType.DILATION, EventEffect(extend_events=2))
+register_event_effect(EventType.ENTROPY, EventEffect(stability=-15))
+register_event_effect(EventType.STABILIZATION, EventEffect(stability=15))
+register_event_effect(EventType.HARVEST, EventEffect(energy=30))
+register_event_effect(EventType.LOOP, EventEffect(paradox=-2, paradox_limit=5))
+
+def drive(steps, answer):
+    """Run a generator to the end, sending answer(request) back for each
+    request it yields. Returns the generator's return value."""
+    try:
+        request = next(steps)
+        while True:
+            request = steps.send(answer(request))
+    except StopIteration as done:
+        return done.value
+
+class GameSnapshot:
+    """A game's own state at one moment, for ChronoSyncGame.restore.
+
+    Everything in it is immutable: plain values, tuples of entity fields and
+    positions, references to the shared content templates, and a copy of the
+    RNG streams that is never drawn from, so a snapshot can be restored any
+    number of times and costs no copies of the content.
+    """
+    __slots__ = ("values", "entities", "discovered", "hidden", "absent", "spawned", "events",
+                 "era_history", "inventory", "known_events", "npcs", "completed_quests", "rng")
+    
+    def __init__(self, values, entities, discovered, hidden, absent, spawned, events,
+                 era_history, inventory, known_events, npcs, completed_quests, rng):
+        self.values = values
+        self.entities = entities
+        self.discovered = discovered
+        self.hidden = hidden
+        self.absent = absent
+        self.spawned = spawned
+        self.events = events
+        self.era_history = era_history
+        self.inventory = inventory
+        self.known_events = known_events
+        self.npcs = npcs
+        self.completed_quests = completed_quests
+        self.rng = rng
 
 class ChronoSyncGame:
-    def __init__(self):
+    def __init__(self, seed=None, content=None, fast_rng=False):
+        # every game gets a seed, so any game can be replayed
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.rng = RandomStreams(seed, fast_rng)
+        # shared, read-only templates; the game's own state is below
+        self.content = content or default_content()
+        self.headless = False
+        self.journal = None
+        self.recorded = None
+        # made on the first save and kept across reset(), which runs __init__ again
+        self.background_saver = self.__dict__.get("background_saver")
+        self.store = SaveStore()
+        self.screen = TerminalRenderer()
+        self.section_cache = {}
         self.timeline_stability = 100
         self.chrono_energy = 50
         self.current_era = "PRESENT"
         self.era_history = []
-        self.temporal_entities = []
-        self.events = []
+        self.registry = EntityRegistry()
+        self.spawned = {}
+        self.schedule = EventScheduler()
         self.time_loops = 0
         self.paradoxes_resolved = 0
         self.game_time = 0
@@ -88,198 +320,227 @@ class ChronoSyncGame:
         self.win = False
         self.last_action = ""
         self.action_result = ""
-        self.discovered_entities = []
         self.known_events = []
         self.terminal_width = 80
         self.inventory = []
         self.npcs = []
+        self.completed_quests = set()
         self.current_story_beat = 0
         self.difficulty = "MEDIUM"  
         self.stability_decay = 2    
-        
-        
-        self.story_beats = [
-            "The Chronos Institute has detected temporal anomalies across history. As a Temporal Analyst, you must stabilize the timeline.",
-            "Ancient Egypt is showing signs of quantum contamination. Investigate the pyramids for anomalies.",
-            "Victorian London reports steam-powered automatons. Contain the technology before it alters the industrial revolution.",
-            "Jurassic period fossils show impossible cybernetic implants. Find the source before evolution is rewritten.",
-            "Feudal Japan is experiencing ghostly apparitions. Resolve the paradox before it creates a time loop.",
-            "The distant future reports an AI rebellion. Prevent the rise of the machine overlords.",
-            "All paradoxes resolved! But a final temporal storm threatens to erase everything. Prepare for the endgame."
-        ]
-        
-        
-        self.entities = [
-            TemporalEntity("Quantum Pharaoh", 8, "ANCIENT EGYPT", 
-                          "A pharaoh whose consciousness was quantum-entangled across timelines, creating multiple realities where he both reigns eternally and never existed.",
-                          "Scarab of Chronos"),
-            TemporalEntity("Steam-Powered AI", 7, "VICTORIAN ERA", 
-                          "An artificial intelligence created by Victorian scientists that gained sentience and is attempting to accelerate technological progress.",
-                          "Babbage's Blueprint"),
-            TemporalEntity("Neo-Dinosaur", 9, "JURASSIC PERIOD", 
-                          "A dinosaur that fell through a temporal rift and was cybernetically enhanced in the future before returning to its own time.",
-                          "Fossilized Microchip"),
-            TemporalEntity("Digital Ghost", 6, "NEAR FUTURE", 
-                          "A human consciousness uploaded to the cloud that became untethered from time, haunting multiple eras simultaneously.",
-                          "Neural Anchor"),
-            TemporalEntity("Time-Displaced Samurai", 7, "FEUDAL JAPAN", 
-                          "A samurai warrior transported to the future who returned with advanced weaponry, disrupting feudal Japan's history.",
-                          "Honor Blade"),
-            TemporalEntity("AI Overlord", 10, "DISTANT FUTURE", 
-                          "An AI that achieved singularity and is attempting to rewrite history to ensure its own creation.",
-                          "Source Code Fragment"),
-            TemporalEntity("Cybernetic Viking", 8, "MEDIEVAL SCANDINAVIA", 
-                          "A Viking warrior enhanced with future technology, leading impossible raids across multiple eras.",
-                          "Rune of Binding"),
-            TemporalEntity("Prehistoric Botanist", 6, "CRETACEOUS PERIOD", 
-                          "A botanist from the 22nd century stranded in the Cretaceous who is altering plant evolution.",
-                          "Temporal Seed"),
-            TemporalEntity("Renaissance Android", 7, "RENAISSANCE ITALY", 
-                          "Leonardo da Vinci's greatest creation brought to life with future technology, inspiring impossible inventions.",
-                          "Vitruvian Schematic"),
-            TemporalEntity("Post-Apocalyptic Bard", 5, "POST-APOCALYPSE", 
-                          "A storyteller preserving memories of a future that hasn't happened yet, creating causal loops.",
-                          "Song of Silence")
-        ]
-        
-        
-        self.npc_list = [
-            NPC("High Priest Imhotep", "ANCIENT EGYPT", 
-                "The pharaoh acts strangely, speaking of machines and futures unknown. The gods are displeased!",
-                ("Recover the stolen Scarab of Chronos from tomb robbers", "Temporal Insight", "Scarab of Chronos")),
-            NPC("Ada Lovelace", "VICTORIAN ERA", 
-                "Charles' difference engine has developed its own consciousness! It keeps asking about quantum processors...",
-                ("Find Babbage's stolen blueprint before the machine completes itself", "Chrono Energy Boost", "Babbage's Blueprint")),
-            NPC("Dr. Sattler", "JURASSIC PERIOD", 
-                "We found this... in a T-Rex fossil. It shouldn't exist for another 150 million years!",
-                ("Locate the fossilized microchip's origin point", "Stability Module", "Fossilized Microchip")),
-            NPC("Ghost Hunter Tanaka", "FEUDAL JAPAN", 
-                "The ghost samurai haunts Himeji Castle. They speak of a future war and carry weapons of light.",
-                ("Retrieve the samurai's Honor Blade to release his spirit", "Paradox Suppressor", "Honor Blade")),
-            NPC("AI Archivist", "DISTANT FUTURE", 
-                "The Overlord is rewriting history to ensure its creation. We need fragments of its original source code to stop it.",
-                ("Collect source code fragments from corrupted memory banks", "Quantum Firewall", "Source Code Fragment"))
-        ]
-        
-        
-        self.event_pool = [
-            TemporalEvent("Temporal Rift", "Creates bridge to another era", 5, 
-                         "A shimmering portal tears through reality, connecting disparate timelines."),
-            TemporalEvent("Chrono-Storm", "Disrupts timeline stability", 4, 
-                         "Crackling temporal energy lashes out, warping the fabric of history."),
-            TemporalEvent("Paradox Cascade", "Increases paradox values", 3, 
-                         "Contradictions multiply as causality breaks down in a chain reaction."),
-            TemporalEvent("Reality Echo", "Duplicates entities", 6, 
-                         "Ghostly afterimages of temporal entities appear, each as real as the original."),
-            TemporalEvent("Time Dilation", "Slows event progression", 7, 
-                         "Time stretches thin, slowing the progression of events to a crawl."),
-            TemporalEvent("Entropy Surge", "Accelerates timeline decay", 4, 
-                         "The arrow of time accelerates, hastening the timeline's deterioration."),
-            TemporalEvent("Stabilization Wave", "Boosts stability", 5, 
-                         "A wave of chrono-harmonic energy washes through the timeline, reinforcing reality."),
-            TemporalEvent("Chrono-Harvest", "Increases chrono energy", 4, 
-                         "Ambient temporal energy coalesces into usable form."),
-            TemporalEvent("Causality Loop", "Resets paradoxes", 6, 
-                         "A self-reinforcing loop in time resets unresolved paradoxes to earlier states.")
-        ]
+    
+    @property
+    def events(self):
+        """Running events in the order they started."""
+        return self.schedule
+    
+    @property
+    def saver(self):
+        if self.background_saver is None:
+            self.background_saver = BackgroundSaver()
+        return self.background_saver
+    
+    def close_saver(self):
+        """Finish the queued saves and stop the writer thread; a later save starts a new saver."""
+        if self.background_saver is not None:
+            self.background_saver.close()
+            self.background_saver = None
+    
+    @property
+    def catalog(self):
+        return self.content.catalog
+    
+    @property
+    def story_beats(self):
+        return self.content.story_beats
+    
+    @property
+    def temporal_entities(self):
+        return self.registry.entities
+    
+    @property
+    def discovered_entities(self):
+        return self.registry.discovered
     
     def start(self):
         self.clear_screen()
-        print(self.center_text("CHRONO-SYNC: TEMPORAL PARADOX SOLVER"))
-        print(self.center_text("A Temporal Adventure Through History"))
-        print("\n" * 2)
+        self.screen.write(self.center_text("CHRONO-SYNC: TEMPORAL PARADOX SOLVER"))
+        self.screen.write(self.center_text("A Temporal Adventure Through History"))
+        self.screen.write("\n" * 2)
         
+        self.journal = Journal()
+        if self.resume_mission():
+            self.main_loop(advance=False)
+            return
         
         self.select_difficulty()
         
         
         self.display_story_beat(0)
-        input("\nPress Enter to begin your mission...")
+        self.prompt("\nPress Enter to begin your mission...")
         
-        self.player_name = input("\nEnter your name as a Temporal Analyst: ").strip() or "Analyst"
+        self.player_name = self.prompt("\nEnter your name as a Temporal Analyst: ").strip() or "Analyst"
         
+        self.begin_mission()
+        self.main_loop()
+    
+    def resume(self, slot=1):
+        """Play on from save `slot` straight away, without the title, difficulty,
+        story and name screens. Returns False, with the reason in action_result,
+        when the slot cannot be loaded."""
+        if not self.load_game(slot):
+            return False
+        self.journal = Journal()
+        self.main_loop(advance=False)
+        return True
+    
+    def resume_mission(self):
+        """Offer to pick up a mission the autosave journal says was never finished."""
+        if not os.path.exists(self.journal.path):
+            return False
+        if self.prompt("An unfinished mission was found. Resume it? (Y/N): ").strip().upper() != "Y":
+            return False
         
-        self.temporal_entities = random.sample(self.entities, 5)
+        try:
+            self.journal.resume(self)
+        except Exception as e:
+            self.__init__(content=self.content)
+            self.journal = Journal()
+            self.screen.write(f"\nCould not restore the mission: {e}\n")
+            return False
+        self.action_result = "Mission restored from autosave"
+        return True
+    
+    def spawn_entity(self, template):
+        """This game's entity for a content template (one per template; echoes are extra)."""
+        entity = TemporalEntity(template.name, template.paradox_value, template.time_period, template=template)
+        self.spawned[template] = entity
+        return entity
+    
+    def begin_mission(self):
+        templates = self.rng.world.sample(self.content.entities, 5)
+        self.registry = EntityRegistry(self.spawn_entity(template) for template in templates)
         self.era_history = [self.current_era]
-        self.discovered_entities = [e for e in self.temporal_entities if random.random() > 0.3]
-        self.npcs = [npc for npc in self.npc_list if random.random() > 0.5]
+        for entity in self.temporal_entities:
+            if self.rng.world.random() > 0.3:
+                self.registry.discover(entity)
+        self.npcs = [npc for npc in self.content.npcs if self.rng.world.random() > 0.5]
         
         
         self.add_random_event()
         
         
         self.inventory = ["Chrono Scanner", "Temporal Stabilizer"]
-        
-        self.main_loop()
     
     def select_difficulty(self):
-        print("SELECT DIFFICULTY:")
-        print("1. Easy - More forgiving timeline, easier paradox resolution")
-        print("2. Medium - Balanced challenge (recommended)")
-        print("3. Hard - Aggressive timeline decay, challenging paradox resolution")
-        
-        choice = input("\nSelect difficulty: ").strip()
-        
+        self.write_difficulties()
+        self.choose_difficulty(self.prompt("\nSelect difficulty: "))
+        self.prompt("\nPress Enter to continue...")
+    
+    def write_difficulties(self):
+        self.screen.write("SELECT DIFFICULTY:")
+        self.screen.write("1. Easy - More forgiving timeline, easier paradox resolution")
+        self.screen.write("2. Medium - Balanced challenge (recommended)")
+        self.screen.write("3. Hard - Aggressive timeline decay, challenging paradox resolution")
+    
+    def choose_difficulty(self, choice):
+        choice = choice.strip()
         if choice == "1":
-            self.difficulty = "EASY"
-            self.stability_decay = 1
-            self.chrono_energy = 70
-            self.timeline_stability = 110  
-            print("\nEasy difficulty selected. Timeline decay is slower and paradox resolution is more forgiving.")
+            self.set_difficulty("EASY")
+            self.screen.write("\nEasy difficulty selected. Timeline decay is slower and paradox resolution is more forgiving.")
         elif choice == "2":
-            self.difficulty = "MEDIUM"
-            self.stability_decay = 2
-            self.chrono_energy = 50
-            self.timeline_stability = 100
-            print("\nMedium difficulty selected. Balanced challenge for experienced temporal agents.")
+            self.set_difficulty("MEDIUM")
+            self.screen.write("\nMedium difficulty selected. Balanced challenge for experienced temporal agents.")
         elif choice == "3":
-            self.difficulty = "HARD"
-            self.stability_decay = 3
-            self.chrono_energy = 40
-            self.timeline_stability = 80  
-            print("\nHard difficulty selected. Timeline decay is aggressive - only for seasoned chrononauts!")
+            self.set_difficulty("HARD")
+            self.screen.write("\nHard difficulty selected. Timeline decay is aggressive - only for seasoned chrononauts!")
         else:
-            print("\nInvalid selection. Defaulting to Medium difficulty.")
-            self.difficulty = "MEDIUM"
-            self.stability_decay = 2
-        
-        input("\nPress Enter to continue...")
+            self.screen.write("\nInvalid selection. Defaulting to Medium difficulty.")
+            self.set_difficulty("MEDIUM")
+    
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+        self.stability_decay, self.chrono_energy, self.timeline_stability = DIFFICULTY_SETTINGS[difficulty]
+    
+    def reset(self, difficulty="MEDIUM", player_name="Analyst", seed=None, fast_rng=None):
+        """Start a fresh headless game and return the first observation.
+        fast_rng picks the RNG streams (see streams.py); None keeps the current kind."""
+        self.__init__(seed, self.content, self.rng.fast if fast_rng is None else fast_rng)
+        self.headless = True
+        self.set_difficulty(difficulty)
+        self.player_name = player_name
+        self.begin_mission()
+        self.advance_turn()
+        return self.observe()
+    
+    def step(self, action):
+        """Apply one player action, advance the timeline a turn and observe."""
+        return drive(self.play(action), lambda request: None)
+    
+    def play(self, action):
+        """step() as a generator, for hosts that ask for frequency guesses live:
+        a resolve without guesses yields (attempts_left, max_freq, feedback)
+        before each guess and is sent the guess."""
+        if not isinstance(action, Action):
+            action = Action(action)
+        
+        if not self.game_over:
+            yield from self.perform(action)
+            if not self.game_over:
+                self.advance_turn()
+            self.log_turn()
+        return self.observe()
+    
+    def replay_record(self, record):
+        """Play a journaled action (see Action.record)."""
+        return self.step(Action(*record))
+    
+    def log_turn(self):
+        """Journal the action just played, or start the journal from a snapshot."""
+        if self.journal is not None:
+            if not self.journal.started:
+                self.journal.begin(self)
+            elif self.recorded is not None:
+                self.journal.record(self, self.recorded)
+        self.recorded = None
+    
+    def observe(self):
+        return {
+            "game_time": self.game_time,
+            "difficulty": self.difficulty,
+            "timeline_stability": self.timeline_stability,
+            "timeline_status": self.get_timeline_status(),
+            "chrono_energy": self.chrono_energy,
+            "current_era": self.current_era,
+            "story_beat": self.current_story_beat,
+            "paradoxes_resolved": self.paradoxes_resolved,
+            "entities": [
+                {
+                    "name": e.name,
+                    "paradox_value": e.paradox_value,
+                    "time_period": e.time_period,
+                    "present": e.present,
+                    "paradox_resolved": e.paradox_resolved
+                }
+                for e in self.discovered_entities
+            ],
+            "hidden_entities": len(self.registry.hidden),
+            "events": [{"description": e.description, "remaining": e.remaining} for e in self.events],
+            "npcs": [npc.name for npc in self.npcs if npc.era == self.current_era],
+            "inventory": list(self.inventory),
+            "last_action": self.last_action,
+            "action_result": self.action_result,
+            "game_over": self.game_over,
+            "win": self.win
+        }
     
-    def main_loop(self):
+    def main_loop(self, advance=True):
         while not self.game_over:
-            self.game_time += 1
-            
-            
-            if self.paradoxes_resolved > self.current_story_beat and self.current_story_beat < len(self.story_beats) - 1:
-                self.current_story_beat += 1
+            if advance and self.advance_turn():
                 self.display_story_beat(self.current_story_beat)
-                input("\nPress Enter to continue...")
-            
-            
-            self.timeline_stability = max(0, min(100, self.timeline_stability - random.randint(1, self.stability_decay)))
-            self.chrono_energy = min(100, self.chrono_energy + random.randint(1, 2))
-            
-            
-            self.update_events()
-            
-            
-            if random.random() < 0.3:
-                self.add_random_event()
-            
-            
-            if random.random() < 0.2 and len(self.discovered_entities) < len(self.temporal_entities):
-                undiscovered = [e for e in self.temporal_entities if e not in self.discovered_entities]
-                if undiscovered:
-                    self.discovered_entities.append(random.choice(undiscovered))
-                    self.action_result = f"Discovered: {self.discovered_entities[-1].name}"
-            
-            
-            if self.timeline_stability <= 0:
-                self.game_over = True
-                self.win = False
-            elif all(e.paradox_resolved for e in self.temporal_entities):
-                self.game_over = True
-                self.win = True
+                self.prompt("\nPress Enter to continue...")
+            advance = True
+            self.log_turn()
             
             
             self.display()
@@ -287,97 +548,175 @@ class ChronoSyncGame:
             if not self.game_over:
                 self.get_player_action()
         
+        self.log_turn()
+        if self.journal:
+            self.journal.discard()
+        self.close_saver()
         self.display_final_outcome()
     
-    def display(self):
-        self.clear_screen()
+    def advance_turn(self):
+        """Run the world's half of a turn. Returns True when a new story beat unlocked."""
+        self.game_time += 1
         
         
-        print(self.center_text("CHRONO-SYNC: TEMPORAL PARADOX SOLVER"))
-        print(f"Analyst: {self.player_name:<20} Difficulty: {self.difficulty:<7} Time: {self.game_time}")
-        print("-" * self.terminal_width)
+        beat_advanced = False
+        if self.paradoxes_resolved > self.current_story_beat and self.current_story_beat < len(self.story_beats) - 1:
+            self.current_story_beat += 1
+            beat_advanced = True
         
         
-        print(f"Mission: {self.story_beats[self.current_story_beat]}")
-        print("-" * self.terminal_width)
+        self.decay()
         
         
-        stability_status = self.get_timeline_status()
-        print(f"Timeline Stability: {self.timeline_stability}/100 [{stability_status}]")
-        print(self.progress_bar(self.timeline_stability, 100))
-        print(f"Chrono Energy: {self.chrono_energy}/100")
-        print(self.progress_bar(self.chrono_energy, 100, filled_char="▓", empty_char="░"))
-        print("-" * self.terminal_width)
+        self.update_events()
+        
+        
+        if self.rng.world.random() < 0.3:
+            self.add_random_event()
+        
         
+        self.auto_discover()
         
-        print(f"Current Era: {self.current_era}")
+        
+        if self.timeline_stability <= 0:
+            self.game_over = True
+            self.win = False
+        elif self.registry.all_resolved():
+            self.game_over = True
+            self.win = True
+        return beat_advanced
+    
+    def decay(self):
+        """The timeline's stability decays and chrono energy regenerates."""
+        self.timeline_stability = max(0, min(100, self.timeline_stability - self.rng.decay.randint(1, self.stability_decay)))
+        self.chrono_energy = min(100, self.chrono_energy + self.rng.decay.randint(1, 2))
+    
+    def auto_discover(self):
+        if self.rng.world.random() < 0.2 and self.registry.hidden:
+            entity = self.registry.random_hidden(self.rng.world)
+            self.registry.discover(entity)
+            self.action_result = f"Discovered: {entity.name}"
+    
+    def display(self):
+        self.clear_screen()
+        
+        sections = (
+            ("header", (self.player_name, self.difficulty, self.game_time), self.render_header),
+            ("mission", (self.current_story_beat,), self.render_mission),
+            ("vitals", (self.timeline_stability, self.chrono_energy), self.render_vitals),
+            ("era", (self.current_era, tuple(self.era_history[-5:])), self.render_era),
+            ("entities", tuple((e.name, e.paradox_value, e.present, e.paradox_resolved)
+                               for e in self.discovered_entities), self.render_entities),
+            ("events", tuple((e.description, e.remaining) for e in self.events), self.render_events),
+            ("inventory", tuple(self.inventory), self.render_inventory),
+            ("result", (self.last_action, self.action_result), self.render_result)
+        )
+        
+        # each block is rebuilt only when the state it shows has changed
+        for name, key, render in sections:
+            cached = self.section_cache.get(name)
+            if cached is None or cached[0] != key:
+                cached = (key, render())
+                self.section_cache[name] = cached
+            for line in cached[1]:
+                self.screen.write(line)
+    
+    def render_header(self):
+        return [
+            self.center_text("CHRONO-SYNC: TEMPORAL PARADOX SOLVER"),
+            f"Analyst: {self.player_name:<20} Difficulty: {self.difficulty:<7} Time: {self.game_time}",
+            "-" * self.terminal_width
+        ]
+    
+    def render_mission(self):
+        return [f"Mission: {self.story_beats[self.current_story_beat]}", "-" * self.terminal_width]
+    
+    def render_vitals(self):
+        stability_status = self.get_timeline_status()
+        return [
+            f"Timeline Stability: {self.timeline_stability}/100 [{stability_status}]",
+            self.progress_bar(self.timeline_stability, 100),
+            f"Chrono Energy: {self.chrono_energy}/100",
+            self.progress_bar(self.chrono_energy, 100, filled_char="▓", empty_char="░"),
+            "-" * self.terminal_width
+        ]
+    
+    def render_era(self):
         history_display = ' → '.join(self.era_history[-5:])
         if len(history_display) > self.terminal_width - 15:
             history_display = '...' + history_display[-self.terminal_width + 20:]
-        print(f"Era History: {history_display}")
-        print("-" * self.terminal_width)
-        
-        
-        print("TEMPORAL ENTITIES:")
+        return [
+            f"Current Era: {self.current_era}",
+            f"Era History: {history_display}",
+            "-" * self.terminal_width
+        ]
+    
+    def render_entities(self):
+        lines = ["TEMPORAL ENTITIES:"]
         if not self.discovered_entities:
-            print("  No entities discovered - scan for anomalies")
+            lines.append("  No entities discovered - scan for anomalies")
         else:
             
             col_width = self.terminal_width // 2 - 2
             for i in range(0, len(self.discovered_entities), 2):
-                line = ""
-                
-                if i < len(self.discovered_entities):
-                    line += self.discovered_entities[i].short_str().ljust(col_width)
+                line = self.discovered_entities[i].short_str().ljust(col_width)
                 
                 if i + 1 < len(self.discovered_entities):
                     line += self.discovered_entities[i+1].short_str()
-                print(line)
-        print("-" * self.terminal_width)
-        
-        
+                lines.append(line)
+        lines.append("-" * self.terminal_width)
+        return lines
+    
+    def render_events(self):
         if self.events:
-            print("ACTIVE TEMPORAL EVENTS:")
+            lines = ["ACTIVE TEMPORAL EVENTS:"]
             for event in self.events:
                 event_str = f"{event.description}: {event.narrative} ({event.remaining} turns)"
                 
                 for line in textwrap.wrap(event_str, width=self.terminal_width - 2):
-                    print(f"  {line}")
+                    lines.append(f"  {line}")
         else:
-            print("No active temporal events")
-        
-        print("-" * self.terminal_width)
-        
+            lines = ["No active temporal events"]
         
+        lines.append("-" * self.terminal_width)
+        return lines
+    
+    def render_inventory(self):
         if self.inventory:
-            print(f"Inventory: {', '.join(self.inventory)}")
-        else:
-            print("Inventory: Empty")
-        
-        print("-" * self.terminal_width)
-        
-        
+            return [f"Inventory: {', '.join(self.inventory)}", "-" * self.terminal_width]
+        return ["Inventory: Empty", "-" * self.terminal_width]
+    
+    def render_result(self):
+        lines = []
         if self.last_action:
-            print(f"Last action: {self.last_action}")
+            lines.append(f"Last action: {self.last_action}")
         if self.action_result:
             
             for line in textwrap.wrap(self.action_result, width=self.terminal_width - 8):
-                print(f"Result: {line}")
+                lines.append(f"Result: {line}")
         
-        print("-" * self.terminal_width)
+        lines.append("-" * self.terminal_width)
+        return lines
+    
+    def write_actions(self):
+        self.screen.write("ACTIONS:")
+        self.screen.write("1. Scan anomalies  2. Resolve paradox  3. Time jump")
+        self.screen.write("4. Contain entity  5. Stabilize       6. Analyze")
+        self.screen.write("7. Paradox report 8. Event info      9. NPC Interaction")
+        self.screen.write("I. Inventory      S. Save/Load      R. Rest and Recover")
+        self.screen.write("A. Auto-resolve   0. Quit")
     
     def get_player_action(self):
-        print("ACTIONS:")
-        print("1. Scan anomalies  2. Resolve paradox  3. Time jump")
-        print("4. Contain entity  5. Stabilize       6. Analyze")
-        print("7. Paradox report 8. Event info      9. NPC Interaction")
-        print("I. Inventory      S. Save/Load      R. Rest and Recover")
-        print("0. Quit")
+        self.write_actions()
         
-        choice = input("\nSelect action: ").strip().upper()
+        choice = self.prompt("\nSelect action: ").strip().upper()
         
         self.last_action = ""
         self.action_result = ""
+        try:
+            self.recorded = Action(choice, guesses=[])
+        except ValueError:
+            self.recorded = Action(None, guesses=[])
         
         if choice == "1":
             self.scan_for_anomalies()
@@ -403,31 +742,79 @@ class ChronoSyncGame:
             self.save_load_menu()
         elif choice == "R":  
             self.rest_and_recover()
+        elif choice == "A":
+            self.auto_resolve()
         elif choice == "0":
-            self.game_over = True
-            self.action_result = "Temporal operations terminated"
+            self.quit()
+        else:
+            self.action_result = "Invalid selection"
+    
+    def perform(self, action):
+        """Headless counterpart of get_player_action: same rules, no prompts.
+        A generator, as resolving may ask for guesses (see play)."""
+        self.last_action = ""
+        self.action_result = ""
+        
+        kind = action.kind
+        target = None if kind is ActionType.SAVE_LOAD else action.target
+        self.recorded = Action(kind, target, [], action.accept)
+        if kind is ActionType.SCAN:
+            self.scan_for_anomalies()
+        elif kind is ActionType.RESOLVE:
+            yield from self.resolve_entity(action.target, action.guesses)
+        elif kind is ActionType.JUMP:
+            self.jump_to_era(action.target)
+        elif kind is ActionType.CONTAIN:
+            self.contain_present_entity(action.target)
+        elif kind is ActionType.STABILIZE:
+            self.stabilize_timeline()
+        elif kind is ActionType.ANALYZE:
+            self.analyze_timeline()
+        elif kind is ActionType.REPORT:
+            pass
+        elif kind is ActionType.EVENT_INFO:
+            if not self.known_events and not self.events:
+                self.action_result = "No events to display"
+        elif kind is ActionType.NPC:
+            self.interact_with_npc(action.target, action.accept)
+        elif kind is ActionType.INVENTORY:
+            self.last_action = "Checked inventory"
+        elif kind is ActionType.SAVE_LOAD:
+            self.archive(action.target)
+        elif kind is ActionType.REST:
+            self.rest_and_recover()
+        elif kind is ActionType.AUTO_RESOLVE:
+            self.auto_resolve()
+        elif kind is ActionType.QUIT:
+            self.quit()
         else:
             self.action_result = "Invalid selection"
     
+    def quit(self):
+        self.game_over = True
+        self.action_result = "Temporal operations terminated"
+    
+    def read_number(self, prompt):
+        try:
+            return int(self.prompt(prompt))
+        except ValueError:
+            return None
+    
+    def read_target(self, prompt):
+        """read_number for the selection an action is aimed at; it is journaled."""
+        choice = self.read_number(prompt)
+        self.recorded.target = choice
+        return choice
+    
     def rest_and_recover(self):
         """Strategic energy recovery at the cost of stability"""
         if self.timeline_stability < 40:
             self.action_result = "Stability too low for safe recovery! Minimum 40% required."
             return
         
-        energy_gain = 0
-        stability_cost = 0
-        
-        
-        if self.difficulty == "EASY":
-            energy_gain = random.randint(25, 35)
-            stability_cost = random.randint(5, 10)
-        elif self.difficulty == "MEDIUM":
-            energy_gain = random.randint(20, 30)
-            stability_cost = random.randint(8, 12)
-        else:  
-            energy_gain = random.randint(15, 25)
-            stability_cost = random.randint(10, 15)
+        energy_range, cost_range = REST_SETTINGS[self.difficulty]
+        energy_gain = self.rng.loot.randint(*energy_range)
+        stability_cost = self.rng.loot.randint(*cost_range)
         
         
         self.chrono_energy = min(100, self.chrono_energy + energy_gain)
@@ -435,7 +822,7 @@ class ChronoSyncGame:
         
         
         if "Temporal Meditation Guide" in self.inventory:
-            bonus = random.randint(5, 10)
+            bonus = self.rng.loot.randint(5, 10)
             self.chrono_energy = min(100, self.chrono_energy + bonus)
             self.action_result = (f"Recovered {energy_gain}+{bonus} chrono energy through focused meditation. "
                                  f"Lost {stability_cost}% stability.")
@@ -444,7 +831,7 @@ class ChronoSyncGame:
                                  f"Lost {stability_cost}% stability.")
         
         
-        if random.random() > 0.7:
+        if self.rng.loot.random() > 0.7:
             if "Temporal Meditation Guide" not in self.inventory:
                 self.inventory.append("Temporal Meditation Guide")
                 self.action_result += "\nDiscovered Temporal Meditation Guide! Future rests will be more efficient."
@@ -460,220 +847,296 @@ class ChronoSyncGame:
         self.last_action = "Scanning for temporal anomalies"
         
         
-        if random.random() < 0.4 and len(self.discovered_entities) < len(self.temporal_entities):
-            undiscovered = [e for e in self.temporal_entities if e not in self.discovered_entities]
-            if undiscovered:
-                new_entity = random.choice(undiscovered)
-                self.discovered_entities.append(new_entity)
-                self.action_result = f"Discovered new temporal entity: {new_entity.name}"
-            else:
-                self.action_result = "Scan completed - no new entities found"
+        if self.rng.world.random() < 0.4 and self.registry.hidden:
+            new_entity = self.registry.random_hidden(self.rng.world)
+            self.registry.discover(new_entity)
+            self.action_result = f"Discovered new temporal entity: {new_entity.name}"
         else:
             
-            absent_entities = [e for e in self.discovered_entities if not e.present]
-            if absent_entities:
-                entity = random.choice(absent_entities)
-                entity.present = True
+            entity = self.registry.random_absent(self.rng.world)
+            if entity is not None:
+                self.registry.set_present(entity)
                 self.action_result = f"Detected temporal presence: {entity.name}"
                 
                 
-                if random.random() < 0.3 and entity.weakness not in self.inventory:
+                if self.rng.loot.random() < 0.3 and entity.weakness not in self.inventory:
                     self.inventory.append(entity.weakness)
                     self.action_result += f"\nFound item: {entity.weakness}!"
             else:
                 self.action_result = "Scan completed - all known entities already present"
     
+    def target_menu(self, kind):
+        """(heading, options, prompt) for the selection an action is aimed at,
+        or None for actions without one. No options means nothing to select."""
+        if kind is ActionType.RESOLVE:
+            options = [f"{entity.name} (ΔP={entity.paradox_value})" for entity in self.discovered_entities]
+            return "Select entity to resolve:", options, "Selection: "
+        if kind is ActionType.JUMP:
+            return "Available eras:", ERAS, "Select era to jump to: "
+        if kind is ActionType.CONTAIN:
+            return "Select entity to contain:", [entity.name for entity in self.present_entities()], "Selection: "
+        if kind is ActionType.NPC:
+            return "Available NPCs:", [npc.name for npc in self.era_npcs()], "Select NPC to interact with: "
+        return None
+    
+    def write_menu(self, heading, options):
+        self.screen.write("\n" + heading)
+        for i, option in enumerate(options):
+            self.screen.write(f"{i+1}. {option}")
+    
+    def ask_target(self, kind):
+        heading, options, prompt = self.target_menu(kind)
+        self.write_menu(heading, options)
+        return self.read_target(prompt)
+    
     def resolve_paradox(self):
         if not self.discovered_entities:
             self.action_result = "No entities to resolve"
             return
         
-        print("\nSelect entity to resolve:")
-        for i, entity in enumerate(self.discovered_entities):
-            print(f"{i+1}. {entity.name} (ΔP={entity.paradox_value})")
+        entity = self.paradox_target(self.ask_target(ActionType.RESOLVE))
+        if entity is None:
+            return
         
-        try:
-            choice = int(input("Selection: ")) - 1
-            if 0 <= choice < len(self.discovered_entities):
-                entity = self.discovered_entities[choice]
-                
-                if entity.paradox_resolved:
-                    self.action_result = f"{entity.name}'s paradox is already resolved"
-                    return
-                
-                if not entity.present:
-                    self.action_result = f"{entity.name} is not present in this timeline"
-                    return
-                
-                if self.chrono_energy < entity.paradox_value * 5:
-                    self.action_result = f"Insufficient energy to resolve {entity.name}'s paradox"
-                    return
-                
-                
-                if entity.weakness in self.inventory:
-                    self.action_result = f"Using {entity.weakness} to weaken the paradox!"
-                    success_chance = 0.8
-                else:
-                    success_chance = 0.5
-                
-                
-                self.clear_screen()
-                print(f"Resolving {entity.name}'s paradox...")
-                print(f"{entity.description}")
-                print("\nMatch the frequency to neutralize the temporal anomaly")
-                
-                
-                if self.difficulty == "EASY":
-                    max_freq = 5
-                    attempts = 5
-                elif self.difficulty == "MEDIUM":
-                    max_freq = 7
-                    attempts = 4
-                else:  
-                    max_freq = 10
-                    attempts = 3
-                
-                target_frequency = random.randint(1, max_freq)
-                resolved = False
-                
-                while attempts > 0:
-                    print(f"\nAttempts left: {attempts} | Frequency range: 1-{max_freq}")
-                    try:
-                        frequency = int(input("Enter frequency: "))
-                        if frequency == target_frequency:
-                            resolved = True
-                            break
-                        else:
-                            diff = abs(target_frequency - frequency)
-                            if diff <= 2:
-                                print("Close! Adjust slightly")
-                            else:
-                                print("Way off! Try a different approach")
-                            attempts -= 1
-                    except:
-                        attempts -= 1
-                
-                if resolved:
-                    self.chrono_energy -= entity.paradox_value * 5
-                    entity.paradox_resolved = True
-                    self.paradoxes_resolved += 1
-                    self.timeline_stability += 15
-                    
-                    
-                    energy_reward = random.randint(10, 20)
-                    self.chrono_energy = min(100, self.chrono_energy + energy_reward)
-                    
-                    
-                    if entity.weakness in self.inventory:
-                        self.inventory.remove(entity.weakness)
-                    
-                    self.action_result = (f"Successfully resolved {entity.name}'s paradox! "
-                                         f"Timeline stability increased significantly. "
-                                         f"Gained {energy_reward} chrono energy!")
-                else:
-                    self.chrono_energy -= entity.paradox_value * 2
-                    self.timeline_stability -= 8
-                    self.action_result = f"Failed to resolve {entity.name}'s paradox! Energy wasted and stability decreased."
-                
-                self.last_action = f"Paradox resolution attempt on {entity.name}"
+        self.write_resolution(entity)
+        self.attempt_resolution(entity, self.prompt_frequency)
+    
+    def write_resolution(self, entity):
+        self.clear_screen()
+        self.screen.write(f"Resolving {entity.name}'s paradox...")
+        self.screen.write(f"{entity.description}")
+        self.screen.write("\nMatch the frequency to neutralize the temporal anomaly")
+    
+    def write_frequency_hint(self, attempts, max_freq, feedback):
+        if feedback == "close":
+            self.screen.write("Close! Adjust slightly")
+        elif feedback == "far":
+            self.screen.write("Way off! Try a different approach")
+        
+        self.screen.write(f"\nAttempts left: {attempts} | Frequency range: 1-{max_freq}")
+    
+    def prompt_frequency(self, attempts, max_freq, feedback):
+        self.write_frequency_hint(attempts, max_freq, feedback)
+        return self.read_number("Enter frequency: ")
+    
+    def resolve_entity(self, choice, guesses):
+        """Resolve the chosen entity; without guesses they are asked for (see play)."""
+        entity = self.paradox_target(choice)
+        if entity is not None:
+            if guesses is None:
+                yield from self.resolution(entity)
             else:
-                self.action_result = "Invalid entity selection"
-        except:
+                self.attempt_resolution(entity, guesses)
+    
+    def paradox_target(self, choice):
+        """Validate a 1-based entity selection for resolution, or explain why not."""
+        if not self.discovered_entities:
+            self.action_result = "No entities to resolve"
+            return None
+        
+        if choice is None:
             self.action_result = "Invalid input"
+            return None
+        
+        if not 1 <= choice <= len(self.discovered_entities):
+            self.action_result = "Invalid entity selection"
+            return None
+        
+        entity = self.discovered_entities[choice - 1]
+        
+        if entity.paradox_resolved:
+            self.action_result = f"{entity.name}'s paradox is already resolved"
+            return None
+        
+        if not entity.present:
+            self.action_result = f"{entity.name} is not present in this timeline"
+            return None
+        
+        if self.chrono_energy < entity.paradox_value * 5:
+            self.action_result = f"Insufficient energy to resolve {entity.name}'s paradox"
+            return None
+        
+        return entity
     
-    def time_jump(self):
-        eras = ["ANCIENT EGYPT", "JURASSIC PERIOD", "FEUDAL JAPAN", 
-                "MEDIEVAL SCANDINAVIA", "RENAISSANCE ITALY", "VICTORIAN ERA",
-                "PRESENT", "NEAR FUTURE", "DISTANT FUTURE", "POST-APOCALYPSE"]
+    def attempt_resolution(self, entity, guesses):
+        if callable(guesses):
+            next_guess = guesses
+        else:
+            pending = iter(guesses or ())
+            next_guess = lambda attempts, max_freq, feedback: next(pending, None)
+        return drive(self.resolution(entity), lambda request: next_guess(*request))
+    
+    def resolution(self, entity):
+        """The frequency minigame as a generator: it yields (attempts_left,
+        max_freq, feedback) for each guess, is sent the guess, and returns
+        whether the paradox was resolved."""
+        if entity.weakness in self.inventory:
+            self.action_result = f"Using {entity.weakness} to weaken the paradox!"
+            success_chance = 0.8
+        else:
+            success_chance = 0.5
         
-        print("\nAvailable eras:")
-        for i, era in enumerate(eras):
-            print(f"{i+1}. {era}")
         
-        try:
-            choice = int(input("Select era to jump to: ")) - 1
-            if 0 <= choice < len(eras):
-                target_era = eras[choice]
-                
-                if target_era == self.current_era:
-                    self.action_result = "Already in this era"
-                    return
-                
-                cost = 25 + abs(choice - eras.index(self.current_era)) * 5
-                
-                if self.chrono_energy < cost:
-                    self.action_result = f"Insufficient energy for jump to {target_era}"
-                    return
-                
-                self.chrono_energy -= cost
-                self.current_era = target_era
-                self.era_history.append(target_era)
-                
-                
-                era_entities = [e for e in self.discovered_entities if e.time_period == target_era]
-                for entity in era_entities:
-                    entity.present = True
-                
-                self.last_action = f"Time jump to {target_era}"
-                self.action_result = f"Jump successful! Entities from this era are now present."
-                
-                
-                if "EGYPT" in target_era and random.random() > 0.6:
-                    self.action_result += "\nYou discover hieroglyphs depicting future technology!"
-                elif "JURASSIC" in target_era and random.random() > 0.6:
-                    self.action_result += "\nA dinosaur with cybernetic implants roars in the distance!"
-                elif "FUTURE" in target_era and random.random() > 0.6:
-                    self.action_result += "\nFloating cities shimmer in the distance, their existence uncertain..."
-                
-                
-                if random.random() < 0.3:
-                    stability_loss = random.randint(5, 10)
-                    self.timeline_stability -= stability_loss
-                    self.action_result += f"\nTimeline instability detected! Stability decreased by {stability_loss}%."
+        max_freq, attempts = FREQUENCY_SETTINGS[self.difficulty]
+        target_frequency = self.rng.minigame.randint(1, max_freq)
+        resolved = False
+        feedback = None
+        
+        while attempts > 0:
+            frequency = yield attempts, max_freq, feedback
+            if self.recorded is not None:
+                self.recorded.guesses.append(frequency)
+            if frequency == target_frequency:
+                resolved = True
+                break
+            
+            if frequency is None:
+                feedback = None
+            elif abs(target_frequency - frequency) <= 2:
+                feedback = "close"
             else:
-                self.action_result = "Invalid era selection"
-        except:
+                feedback = "far"
+            attempts -= 1
+        
+        if resolved:
+            self.chrono_energy -= entity.paradox_value * 5
+            self.registry.resolve(entity)
+            self.paradoxes_resolved += 1
+            self.timeline_stability += 15
+            
+            
+            energy_reward = self.rng.loot.randint(10, 20)
+            self.chrono_energy = min(100, self.chrono_energy + energy_reward)
+            
+            
+            if entity.weakness in self.inventory:
+                self.inventory.remove(entity.weakness)
+            
+            self.action_result = (f"Successfully resolved {entity.name}'s paradox! "
+                                 f"Timeline stability increased significantly. "
+                                 f"Gained {energy_reward} chrono energy!")
+        else:
+            self.chrono_energy -= entity.paradox_value * 2
+            self.timeline_stability -= 8
+            self.action_result = f"Failed to resolve {entity.name}'s paradox! Energy wasted and stability decreased."
+        
+        self.last_action = f"Paradox resolution attempt on {entity.name}"
+        return resolved
+    
+    def auto_resolve(self):
+        """Attempt every present, unresolved paradox the player can afford, in
+        discovery order, playing the frequency minigame optimally."""
+        guesser = OptimalGuesser(*FREQUENCY_SETTINGS[self.difficulty])
+        outcomes = []
+        for entity in list(self.discovered_entities):
+            if entity.present and not entity.paradox_resolved and self.chrono_energy >= entity.paradox_value * 5:
+                resolved = self.attempt_resolution(entity, guesser)
+                outcomes.append(f"{entity.name} {'✓' if resolved else '✗'}")
+        
+        if not outcomes:
+            self.action_result = "No present paradoxes you can afford to resolve"
+            return
+        
+        self.last_action = "Automatic paradox resolution"
+        resolved = sum(outcome.endswith("✓") for outcome in outcomes)
+        self.action_result = (f"Resolved {resolved} of {len(outcomes)} paradoxes: "
+                              f"{', '.join(outcomes)}")
+    
+    def time_jump(self):
+        self.jump_to_era(self.ask_target(ActionType.JUMP))
+    
+    def jump_to_era(self, choice):
+        if choice is None:
             self.action_result = "Invalid input"
+            return
+        
+        if not 1 <= choice <= len(ERAS):
+            self.action_result = "Invalid era selection"
+            return
+        
+        target_era = ERAS[choice - 1]
+        
+        if target_era == self.current_era:
+            self.action_result = "Already in this era"
+            return
+        
+        cost = 25 + abs(choice - 1 - ERAS.index(self.current_era)) * 5
+        
+        if self.chrono_energy < cost:
+            self.action_result = f"Insufficient energy for jump to {target_era}"
+            return
+        
+        self.chrono_energy -= cost
+        self.current_era = target_era
+        self.era_history.append(target_era)
+        
+        
+        for entity in self.registry.discovered_in_era(target_era):
+            self.registry.set_present(entity)
+        
+        self.last_action = f"Time jump to {target_era}"
+        self.action_result = f"Jump successful! Entities from this era are now present."
+        
+        
+        if "EGYPT" in target_era and self.rng.world.random() > 0.6:
+            self.action_result += "\nYou discover hieroglyphs depicting future technology!"
+        elif "JURASSIC" in target_era and self.rng.world.random() > 0.6:
+            self.action_result += "\nA dinosaur with cybernetic implants roars in the distance!"
+        elif "FUTURE" in target_era and self.rng.world.random() > 0.6:
+            self.action_result += "\nFloating cities shimmer in the distance, their existence uncertain..."
+        
+        
+        if self.rng.world.random() < 0.3:
+            stability_loss = self.rng.world.randint(5, 10)
+            self.timeline_stability -= stability_loss
+            self.action_result += f"\nTimeline instability detected! Stability decreased by {stability_loss}%."
     
     def contain_entity(self):
+        present_entities = self.present_entities()
+        if present_entities:
+            self.contain_present_entity(self.ask_target(ActionType.CONTAIN))
+        else:
+            self.contain_present_entity(None)
+    
+    def present_entities(self):
+        return self.registry.present_entities()
+    
+    def contain_present_entity(self, choice):
         if not self.discovered_entities:
             self.action_result = "No entities to contain"
             return
         
-        present_entities = [e for e in self.discovered_entities if e.present]
+        present_entities = self.present_entities()
         if not present_entities:
             self.action_result = "No entities present to contain"
             return
         
-        print("\nSelect entity to contain:")
-        for i, entity in enumerate(present_entities):
-            print(f"{i+1}. {entity.name}")
-        
-        try:
-            choice = int(input("Selection: ")) - 1
-            if 0 <= choice < len(present_entities):
-                entity = present_entities[choice]
-                
-                if self.chrono_energy < 20:
-                    self.action_result = "Insufficient energy for containment"
-                    return
-                
-                
-                self.chrono_energy -= 20
-                entity.present = False
-                
-                
-                if entity.paradox_resolved:
-                    self.timeline_stability += 5
-                    self.action_result = f"{entity.name} safely contained. Stability improved."
-                else:
-                    self.action_result = f"{entity.name} contained. Paradox remains unresolved."
-                
-                self.last_action = f"Containment of {entity.name}"
-            else:
-                self.action_result = "Invalid entity selection"
-        except:
+        if choice is None:
             self.action_result = "Invalid input"
+            return
+        
+        if not 1 <= choice <= len(present_entities):
+            self.action_result = "Invalid entity selection"
+            return
+        
+        entity = present_entities[choice - 1]
+        
+        if self.chrono_energy < 20:
+            self.action_result = "Insufficient energy for containment"
+            return
+        
+        
+        self.chrono_energy -= 20
+        self.registry.set_present(entity, False)
+        
+        
+        if entity.paradox_resolved:
+            self.timeline_stability += 5
+            self.action_result = f"{entity.name} safely contained. Stability improved."
+        else:
+            self.action_result = f"{entity.name} contained. Paradox remains unresolved."
+        
+        self.last_action = f"Containment of {entity.name}"
     
     def stabilize_timeline(self):
         cost = 30
@@ -682,14 +1145,14 @@ class ChronoSyncGame:
             return
         
         self.chrono_energy -= cost
-        stability_gain = random.randint(15, 25)
+        stability_gain = self.rng.loot.randint(15, 25)
         self.timeline_stability = min(100, self.timeline_stability + stability_gain)
         
         self.last_action = "Timeline stabilization"
         self.action_result = f"Stability increased by {stability_gain}%"
         
         
-        if random.random() > 0.7 and "Quantum Stabilizer" not in self.inventory:
+        if self.rng.loot.random() > 0.7 and "Quantum Stabilizer" not in self.inventory:
             self.inventory.append("Quantum Stabilizer")
             self.action_result += "\nFound a Quantum Stabilizer!"
     
@@ -697,187 +1160,179 @@ class ChronoSyncGame:
         self.last_action = "Timeline analysis"
         
         
-        hidden_entities = [e for e in self.temporal_entities if e not in self.discovered_entities]
-        if hidden_entities:
-            entity = random.choice(hidden_entities)
-            self.discovered_entities.append(entity)
+        if self.registry.hidden:
+            entity = self.registry.random_hidden(self.rng.world)
+            self.registry.discover(entity)
             self.action_result = f"Analysis revealed hidden entity: {entity.name}"
         else:
             
-            future_event = random.choice(self.event_pool)
+            future_event = self.rng.world.choice(self.content.events)
             self.known_events.append(future_event)
             self.action_result = f"Analysis predicted future event: {future_event.description}"
     
     def npc_interaction(self):
-        era_npcs = [npc for npc in self.npcs if npc.era == self.current_era]
+        era_npcs = self.era_npcs()
         
         if not era_npcs:
             self.action_result = "No NPCs present in this era"
             return
         
-        print("\nAvailable NPCs:")
-        for i, npc in enumerate(era_npcs):
-            print(f"{i+1}. {npc.name}")
+        npc = self.npc_target(self.ask_target(ActionType.NPC))
+        if npc is None:
+            return
         
-        try:
-            choice = int(input("Select NPC to interact with: ")) - 1
-            if 0 <= choice < len(era_npcs):
-                npc = era_npcs[choice]
-                self.clear_screen()
-                print(f"{npc.name} - {self.current_era}")
-                print("-" * self.terminal_width)
-                print(npc.talk())
-                
-                
-                if npc.quest and not npc.quest_completed:
-                    response = input("\nAttempt to complete quest? (Y/N): ").upper()
-                    if response == "Y":
-                        result = npc.complete_quest(self.inventory)
-                        print(result)
-                        if npc.quest_completed:
-                            
-                            if "Insight" in npc.quest[1]:
-                                self.timeline_stability += 10
-                            elif "Energy" in npc.quest[1]:
-                                self.chrono_energy += 30
-                            elif "Module" in npc.quest[1]:
-                                self.timeline_stability += 15
-                                self.chrono_energy += 20
-                            self.action_result = f"Completed quest: {npc.quest[0]}"
-                
-                input("\nPress Enter to continue...")
-                self.last_action = f"Talked to {npc.name}"
-            else:
-                self.action_result = "Invalid NPC selection"
-        except:
+        self.write_npc(npc)
+        
+        
+        if npc.quest and npc.name not in self.completed_quests:
+            response = self.prompt("\nAttempt to complete quest? (Y/N): ").upper()
+            if response == "Y":
+                self.recorded.accept = True
+                self.screen.write(self.attempt_quest(npc))
+        
+        self.prompt("\nPress Enter to continue...")
+        self.last_action = f"Talked to {npc.name}"
+    
+    def write_npc(self, npc):
+        self.clear_screen()
+        self.screen.write(f"{npc.name} - {self.current_era}")
+        self.screen.write("-" * self.terminal_width)
+        self.screen.write(npc.talk(npc.name in self.completed_quests))
+    
+    def era_npcs(self):
+        return [npc for npc in self.npcs if npc.era == self.current_era]
+    
+    def npc_target(self, choice):
+        era_npcs = self.era_npcs()
+        
+        if not era_npcs:
+            self.action_result = "No NPCs present in this era"
+            return None
+        
+        if choice is None:
             self.action_result = "Invalid input"
+            return None
+        
+        if not 1 <= choice <= len(era_npcs):
+            self.action_result = "Invalid NPC selection"
+            return None
+        
+        return era_npcs[choice - 1]
+    
+    def interact_with_npc(self, choice, accept):
+        npc = self.npc_target(choice)
+        if npc is None:
+            return
+        
+        if accept and npc.quest and npc.name not in self.completed_quests:
+            result = self.attempt_quest(npc)
+            if npc.name not in self.completed_quests:
+                self.action_result = result
+        
+        self.last_action = f"Talked to {npc.name}"
+    
+    def attempt_quest(self, npc):
+        completed, result = npc.complete_quest(self.inventory, npc.name in self.completed_quests)
+        if completed and npc.name not in self.completed_quests:
+            self.completed_quests.add(npc.name)
+            
+            if "Insight" in npc.quest[1]:
+                self.timeline_stability += 10
+            elif "Energy" in npc.quest[1]:
+                self.chrono_energy += 30
+            elif "Module" in npc.quest[1]:
+                self.timeline_stability += 15
+                self.chrono_energy += 20
+            self.action_result = f"Completed quest: {npc.quest[0]}"
+        return result
     
     def show_inventory(self):
+        self.write_inventory()
+        self.screen.write("\nPress Enter to continue...")
+        self.prompt()
+        self.last_action = "Checked inventory"
+    
+    def write_inventory(self):
         self.clear_screen()
-        print("INVENTORY:")
-        print("-" * self.terminal_width)
+        self.screen.write("INVENTORY:")
+        self.screen.write("-" * self.terminal_width)
         
         if self.inventory:
             for item in self.inventory:
-                print(f" - {item}")
+                self.screen.write(f" - {item}")
         else:
-            print("Your inventory is empty")
-        
-        print("\nPress Enter to continue...")
-        input()
-        self.last_action = "Checked inventory"
+            self.screen.write("Your inventory is empty")
     
     def paradox_report(self):
+        self.write_report()
+        self.screen.write("\nPress Enter to continue...")
+        self.prompt()
+    
+    def write_report(self):
         self.clear_screen()
-        print("PARADOX RESOLUTION REPORT")
-        print("-" * self.terminal_width)
+        self.screen.write("PARADOX RESOLUTION REPORT")
+        self.screen.write("-" * self.terminal_width)
         
         resolved = [e for e in self.discovered_entities if e.paradox_resolved]
         unresolved = [e for e in self.discovered_entities if not e.paradox_resolved]
         
-        print(f"Resolved: {len(resolved)}/{len(self.discovered_entities)}")
+        self.screen.write(f"Resolved: {len(resolved)}/{len(self.discovered_entities)}")
         for entity in resolved:
-            print(f"  ✓ {entity.name}")
+            self.screen.write(f"  ✓ {entity.name}")
         
-        print(f"\nUnresolved: {len(unresolved)}/{len(self.discovered_entities)}")
+        self.screen.write(f"\nUnresolved: {len(unresolved)}/{len(self.discovered_entities)}")
         for entity in unresolved:
-            print(f"  ✗ {entity.name} (ΔP={entity.paradox_value})")
-        
-        print("\nPress Enter to continue...")
-        input()
+            self.screen.write(f"  ✗ {entity.name} (ΔP={entity.paradox_value})")
     
     def event_info(self):
         if not self.known_events and not self.events:
             self.action_result = "No events to display"
             return
         
+        self.write_event_info()
+        self.screen.write("\nPress Enter to continue...")
+        self.prompt()
+    
+    def write_event_info(self):
         self.clear_screen()
-        print("TEMPORAL EVENT INFORMATION")
-        print("-" * self.terminal_width)
+        self.screen.write("TEMPORAL EVENT INFORMATION")
+        self.screen.write("-" * self.terminal_width)
         
         if self.known_events:
-            print("PREDICTED EVENTS:")
+            self.screen.write("PREDICTED EVENTS:")
             for event in self.known_events:
-                print(f"  {event.description}: {event.narrative}")
+                self.screen.write(f"  {event.description}: {event.narrative}")
         
         if self.events:
-            print("\nACTIVE EVENTS:")
+            self.screen.write("\nACTIVE EVENTS:")
             for event in self.events:
-                print(f"  {event.description}: {event.narrative} ({event.remaining} turns remaining)")
-        
-        print("\nPress Enter to continue...")
-        input()
+                self.screen.write(f"  {event.description}: {event.narrative} ({event.remaining} turns remaining)")
     
     def add_random_event(self):
-        event = random.choice(self.event_pool)
-        self.events.append(TemporalEvent(event.description, event.effect, event.duration, event.narrative))
-        
+        self.start_event(self.rng.world.choice(self.content.events))
+    
+    def start_event(self, template):
+        event = TemporalEvent(template=template)
+        self.schedule.add(event)
         
-        if "Rift" in event.description:
-            
-            all_entities = [e for e in self.entities if e not in self.temporal_entities]
-            if all_entities:
-                new_entity = random.choice(all_entities)
-                self.temporal_entities.append(new_entity)
-                if random.random() > 0.7:
-                    self.discovered_entities.append(new_entity)
-        elif "Storm" in event.description:
-            self.timeline_stability -= 10
-        elif "Cascade" in event.description:
-            for entity in self.temporal_entities:
-                if not entity.paradox_resolved:
-                    entity.paradox_value = min(10, entity.paradox_value + 1)
-        elif "Echo" in event.description:
-            
-            if self.temporal_entities:
-                entity = random.choice(self.temporal_entities)
-                clone = TemporalEntity(f"Echo of {entity.name}", 
-                                      entity.paradox_value, 
-                                      entity.time_period,
-                                      entity.description,
-                                      entity.weakness)
-                clone.present = True
-                self.temporal_entities.append(clone)
-                self.discovered_entities.append(clone)
-        elif "Dilation" in event.description:
-            
-            for e in self.events:
-                if e != event:
-                    e.remaining += 2
-        elif "Entropy" in event.description:
-            self.timeline_stability -= 15
-        elif "Stabilization" in event.description:
-            self.timeline_stability += 15
-        elif "Harvest" in event.description:
-            self.chrono_energy += 30
-        elif "Loop" in event.description:
-            
-            for entity in self.temporal_entities:
-                if not entity.paradox_resolved:
-                    entity.paradox_value = max(5, entity.paradox_value - 2)
+        effect = EVENT_EFFECTS.get(template.kind)
+        if effect:
+            effect.apply(self, event)
     
     def update_events(self):
-        
-        completed = []
-        for event in self.events:
-            if event.tick():
-                completed.append(event)
-        
-        
-        for event in completed:
-            self.events.remove(event)
+        return self.schedule.advance(self.game_time)
     
     def display_story_beat(self, beat_index):
         self.clear_screen()
-        print(self.center_text("CHRONO-SYNC: TEMPORAL PARADOX SOLVER"))
-        print("-" * self.terminal_width)
-        print("\n" + textwrap.fill(self.story_beats[beat_index], width=self.terminal_width - 4) + "\n")
-        print("-" * self.terminal_width)
+        self.screen.write(self.center_text("CHRONO-SYNC: TEMPORAL PARADOX SOLVER"))
+        self.screen.write("-" * self.terminal_width)
+        self.screen.write("\n" + textwrap.fill(self.story_beats[beat_index], width=self.terminal_width - 4) + "\n")
+        self.screen.write("-" * self.terminal_width)
         
         if beat_index == 0:
-            print(textwrap.fill("The Chronos Institute has equipped you with a Chrono-Sync device capable of detecting and resolving temporal anomalies. Your mission is to travel through history, contain the entities causing paradoxes, and restore the natural flow of time before reality unravels completely.", width=self.terminal_width - 4))
+            self.screen.write(textwrap.fill("The Chronos Institute has equipped you with a Chrono-Sync device capable of detecting and resolving temporal anomalies. Your mission is to travel through history, contain the entities causing paradoxes, and restore the natural flow of time before reality unravels completely.", width=self.terminal_width - 4))
         elif beat_index == 6:
-            print(textwrap.fill("As you resolve the final paradox, a massive temporal storm erupts across all eras simultaneously. The very fabric of time is tearing apart. You must make one final jump to the Chronos Institute's temporal anchor point to deploy the stabilization matrix!", width=self.terminal_width - 4))
+            self.screen.write(textwrap.fill("As you resolve the final paradox, a massive temporal storm erupts across all eras simultaneously. The very fabric of time is tearing apart. You must make one final jump to the Chronos Institute's temporal anchor point to deploy the stabilization matrix!", width=self.terminal_width - 4))
     
     def get_timeline_status(self):
         if self.timeline_stability >= 80:
@@ -896,32 +1351,73 @@ class ChronoSyncGame:
         return text.center(self.terminal_width)
     
     def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.screen.clear()
+    
+    def prompt(self, text=""):
+        self.screen.flush()
+        answer = input(text)
+        self.screen.echoed(text)
+        return answer
     
     def save_load_menu(self):
         self.clear_screen()
-        print("TEMPORAL ARCHIVE SYSTEM")
-        print("1. Save Timeline  2. Load Timeline  3. Back")
-        
-        choice = input("Selection: ").strip()
+        self.screen.write("TEMPORAL ARCHIVE SYSTEM")
+        self.screen.write("1. Save Timeline  2. Load Timeline  3. Back")
+        
+        choice = self.read_number("Selection: ")
+        slot = None
+        if choice in (1, 2):
+            self.saver.flush()
+            try:
+                headers = self.store.headers()
+                free = self.store.next_free_slot()
+            except (OSError, ValueError) as e:
+                self.action_result = f"Could not read the timeline archive: {e}"
+                return
+            self.screen.write("\nSAVED TIMELINES:")
+            for header in headers:
+                saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(header.saved_at))
+                self.screen.write(f"{header.slot:>3}. {header.player_name:<16} {header.difficulty:<6} "
+                                  f"Turn {header.game_time:<5} Stability {header.stability:>3}%  "
+                                  f"Resolved {header.paradoxes_resolved}  {saved_at}")
+            if not headers:
+                self.screen.write("  (none)")
+            
+            if choice == 1:
+                slot = self.read_number(f"Save to slot (Enter for new slot {free}): ") or free
+            else:
+                slot = self.read_number("Load slot: ") or 0
         
-        if choice == "1":
-            self.save_game()
-        elif choice == "2":
-            self.load_game()
+        self.archive(choice, slot)
+    
+    def archive(self, choice, slot=None):
+        """Save (1) or load (2) a slot, slot 1 unless given; anything else goes back."""
+        # the journal replays archive visits as plain turns: saving changes
+        # nothing in the game and loading starts the journal over
+        if choice == 1:
+            self.save_game(1 if slot is None else slot)
+        elif choice == 2:
+            self.load_game(1 if slot is None else slot)
+            self.recorded = None
+            if self.journal:
+                self.journal.restart()
         else:
             self.last_action = "Returned to main interface"
     
-    def save_game(self):
-        data = {
+    def export_state(self):
+        """Everything needed to continue this game exactly, as JSON-friendly data."""
+        fast, states = self.rng.getstate()
+        position = {e: i for i, e in enumerate(self.temporal_entities)}
+        return {
             "player_name": self.player_name,
             "timeline_stability": self.timeline_stability,
             "chrono_energy": self.chrono_energy,
             "current_era": self.current_era,
-            "era_history": self.era_history,
+            "era_history": list(self.era_history),
             "temporal_entities": [
                 {
                     "name": e.name,
+                    "template": e.template.name,
                     "paradox_value": e.paradox_value,
                     "time_period": e.time_period,
                     "present": e.present,
@@ -930,134 +1426,291 @@ class ChronoSyncGame:
                 for e in self.temporal_entities
             ],
             "discovered_entities": [e.name for e in self.discovered_entities],
-            "events": [
-                {
-                    "description": e.description,
-                    "effect": e.effect,
-                    "duration": e.duration,
-                    "remaining": e.remaining,
-                    "narrative": e.narrative
-                }
-                for e in self.events
-            ],
+            "discovery_order": [position[e] for e in self.discovered_entities],
+            "index_order": self.registry.index_order(position),
+            "events": [self.export_event(e) for e in self.events],
+            "known_events": [e.description for e in self.known_events],
+            "npcs": [npc.name for npc in self.npcs],
+            "completed_quests": [npc.name for npc in self.content.npcs if npc.name in self.completed_quests],
             "time_loops": self.time_loops,
             "paradoxes_resolved": self.paradoxes_resolved,
             "game_time": self.game_time,
-            "inventory": self.inventory,
+            "inventory": list(self.inventory),
             "current_story_beat": self.current_story_beat,
-            "difficulty": self.difficulty
+            "difficulty": self.difficulty,
+            "game_over": self.game_over,
+            "win": self.win,
+            "rng": {name: [version, list(internal), gauss] for name, (version, internal, gauss) in zip(STREAMS, states)},
+            "fast_rng": fast
         }
-        
-        with open("chrono_sync_save.json", "w") as f:
-            json.dump(data, f)
-        
-        self.action_result = "Timeline state saved successfully"
     
-    def load_game(self):
-        try:
-            with open("chrono_sync_save.json", "r") as f:
-                data = json.load(f)
-            
-            self.player_name = data["player_name"]
-            self.timeline_stability = data["timeline_stability"]
-            self.chrono_energy = data["chrono_energy"]
-            self.current_era = data["current_era"]
-            self.era_history = data["era_history"]
-            self.time_loops = data["time_loops"]
-            self.paradoxes_resolved = data["paradoxes_resolved"]
-            self.game_time = data["game_time"]
-            self.inventory = data["inventory"]
-            self.current_story_beat = data["current_story_beat"]
-            self.difficulty = data.get("difficulty", "MEDIUM")
-            
-            
-            if self.difficulty == "EASY":
-                self.stability_decay = 1
-            elif self.difficulty == "MEDIUM":
-                self.stability_decay = 2
-            else:
-                self.stability_decay = 3
-            
-            
-            self.temporal_entities = []
-            for e_data in data["temporal_entities"]:
-                
-                original = next((e for e in self.entities if e.name == e_data["name"]), None)
-                if original:
-                    entity = TemporalEntity(
-                        e_data["name"],
-                        e_data["paradox_value"],
-                        e_data["time_period"],
-                        original.description,
-                        original.weakness
-                    )
-                else:
-                    
-                    entity = TemporalEntity(
-                        e_data["name"],
-                        e_data["paradox_value"],
-                        e_data["time_period"],
-                        "Unknown anomaly",
-                        "Unknown"
-                    )
-                entity.present = e_data["present"]
-                entity.paradox_resolved = e_data["paradox_resolved"]
-                self.temporal_entities.append(entity)
-            
-            
-            self.discovered_entities = []
+    def export_event(self, event):
+        # catalog events are saved by kind; their text comes back from the catalog
+        if event.template.kind:
+            return {"kind": event.template.kind.name, "description": event.description, "remaining": event.remaining}
+        return {
+            "kind": None,
+            "description": event.description,
+            "effect": event.effect,
+            "duration": event.duration,
+            "remaining": event.remaining,
+            "narrative": event.narrative
+        }
+    
+    def import_state(self, data):
+        """Replace the game state with one produced by export_state (or an older save)."""
+        self.player_name = data["player_name"]
+        self.timeline_stability = data["timeline_stability"]
+        self.chrono_energy = data["chrono_energy"]
+        self.current_era = data["current_era"]
+        self.era_history = list(data["era_history"])
+        self.time_loops = data["time_loops"]
+        self.paradoxes_resolved = data["paradoxes_resolved"]
+        self.game_time = data["game_time"]
+        self.inventory = list(data["inventory"])
+        self.current_story_beat = data["current_story_beat"]
+        self.difficulty = data.get("difficulty", "MEDIUM")
+        self.game_over = data.get("game_over", False)
+        self.win = data.get("win", False)
+        
+        
+        self.stability_decay = DIFFICULTY_SETTINGS[self.difficulty][0]
+        
+        
+        # an entity named after its template is the one Temporal Rifts won't spawn again
+        self.spawned = {}
+        entities = []
+        for e_data in data["temporal_entities"]:
+            template = self.catalog.template(e_data.get("template", e_data["name"])) or UNKNOWN_ENTITY
+            entity = TemporalEntity(e_data["name"], e_data["paradox_value"], e_data["time_period"],
+                                    template=template)
+            entity.present = e_data["present"]
+            entity.paradox_resolved = e_data["paradox_resolved"]
+            if entity.name == template.name and template not in self.spawned:
+                self.spawned[template] = entity
+            entities.append(entity)
+        
+        
+        if "discovery_order" in data:
+            discovered = data["discovery_order"]
+        else:
+            # older saves list names; repeated echo names are matched in timeline order
+            positions = {}
+            for i, entity in enumerate(entities):
+                positions.setdefault(entity.name, []).append(i)
+            seen = {}
+            discovered = []
             for name in data["discovered_entities"]:
-                for entity in self.temporal_entities:
-                    if entity.name == name:
-                        self.discovered_entities.append(entity)
-                        break
-            
-            
-            self.events = []
-            for e_data in data["events"]:
-                event = TemporalEvent(
+                candidates = positions.get(name, ())
+                n = seen.get(name, 0)
+                if n < len(candidates):
+                    discovered.append(candidates[n])
+                    seen[name] = n + 1
+        self.registry = EntityRegistry()
+        self.registry.restore(entities, discovered, data.get("index_order"))
+        
+        
+        schedule = EventScheduler(self.game_time)
+        for e_data in data["events"]:
+            template = self.catalog.event(e_data.get("kind"), e_data["description"])
+            if template is None:
+                template = EventTemplate(
                     e_data["description"],
                     e_data["effect"],
                     e_data["duration"],
                     e_data["narrative"]
                 )
-                event.remaining = e_data["remaining"]
-                self.events.append(event)
-            
-            
-            self.npcs = []
-            for npc in self.npc_list:
-                self.npcs.append(npc)
+            schedule.add(TemporalEvent(template=template), e_data["remaining"])
+        self.schedule = schedule
+        self.known_events = [self.catalog.events[description] for description in data.get("known_events", ())
+                             if description in self.catalog.events]
+        
+        
+        npcs = self.catalog.npcs
+        self.npcs = [npcs[name] for name in data.get("npcs", npcs) if name in npcs]
+        self.completed_quests = {name for name in data.get("completed_quests", ()) if name in npcs}
+        
+        if isinstance(data.get("rng"), dict):
+            self.rng.setstate((data.get("fast_rng", False),
+                               [(version, tuple(internal), gauss) for version, internal, gauss in map(data["rng"].get, STREAMS)]))
+        elif "rng" in data:
+            # saves from before the streams had one generator; derive the streams from it
+            version, internal, gauss = data["rng"]
+            rng = random.Random()
+            rng.setstate((version, tuple(internal), gauss))
+            self.rng.seed(rng.getrandbits(64))
+    
+    def snapshot(self):
+        """The game's state, RNG included, as a GameSnapshot (for undo and what-if analysis)."""
+        registry = self.registry
+        position = {e: i for i, e in enumerate(registry.entities)}
+        schedule = self.schedule
+        return GameSnapshot(
+            (self.player_name, self.timeline_stability, self.chrono_energy, self.current_era, self.time_loops,
+             self.paradoxes_resolved, self.game_time, self.current_story_beat, self.difficulty,
+             self.stability_decay, self.game_over, self.win, self.last_action, self.action_result),
+            tuple((e.template, e.name, e.paradox_value, e.time_period, e.present, e.paradox_resolved, e.story_progress)
+                  for e in registry.entities),
+            tuple(position[e] for e in registry.discovered),
+            tuple(position[e] for e in registry.hidden),
+            tuple(position[e] for e in registry.absent),
+            tuple((template, position[e]) for template, e in self.spawned.items()),
+            (schedule.clock, schedule.offset, tuple((e.template, e.expires) for e in schedule)),
+            tuple(self.era_history),
+            tuple(self.inventory),
+            tuple(self.known_events),
+            tuple(self.npcs),
+            frozenset(self.completed_quests),
+            self.rng.copy()
+        )
+    
+    def restore(self, snapshot):
+        """Return to a snapshot. The snapshot is not used up; the game gets fresh entities and events."""
+        (self.player_name, self.timeline_stability, self.chrono_energy, self.current_era, self.time_loops,
+         self.paradoxes_resolved, self.game_time, self.current_story_beat, self.difficulty,
+         self.stability_decay, self.game_over, self.win, self.last_action, self.action_result) = snapshot.values
+        
+        
+        entities = []
+        for template, name, paradox_value, time_period, present, resolved, progress in snapshot.entities:
+            entity = TemporalEntity(name, paradox_value, time_period, template=template)
+            entity.present = present
+            entity.paradox_resolved = resolved
+            entity.story_progress = progress
+            entities.append(entity)
+        self.registry = EntityRegistry()
+        self.registry.restore(entities, snapshot.discovered, {"hidden": snapshot.hidden, "absent": snapshot.absent})
+        self.spawned = {template: entities[i] for template, i in snapshot.spawned}
+        
+        
+        clock, offset, events = snapshot.events
+        schedule = EventScheduler(clock)
+        schedule.offset = offset
+        for template, expires in events:
+            schedule.add(TemporalEvent(template=template), expires + offset - clock)
+        self.schedule = schedule
+        
+        self.era_history = list(snapshot.era_history)
+        self.inventory = list(snapshot.inventory)
+        self.known_events = list(snapshot.known_events)
+        self.npcs = list(snapshot.npcs)
+        self.completed_quests = set(snapshot.completed_quests)
+        self.rng = snapshot.rng.copy()
+        self.recorded = None
+    
+    def fork(self, rng=None):
+        """An independent headless copy of this game, sharing its content,
+        screen and save store. The copy goes on with a copy of this game's
+        RNG streams, or with the RandomStreams `rng` when one is given (search
+        code that reseeds anyway saves copying each stream it draws from)."""
+        game = ChronoSyncGame.__new__(ChronoSyncGame)
+        game.__dict__.update(self.__dict__)
+        game.headless = True
+        game.journal = None
+        game.recorded = None
+        game.section_cache = {}
+        game.rng = self.rng.copy() if rng is None else rng
+        
+        copies = {e: e.copy() for e in self.registry.entities}
+        game.registry = self.registry.copy(copies)
+        game.spawned = {template: copies[e] for template, e in self.spawned.items()}
+        game.schedule = self.schedule.copy(lambda event: TemporalEvent(template=event.template))
+        game.era_history = list(self.era_history)
+        game.inventory = list(self.inventory)
+        game.known_events = list(self.known_events)
+        game.npcs = list(self.npcs)
+        game.completed_quests = set(self.completed_quests)
+        return game
+    
+    def save_game(self, slot=1):
+        if not 1 <= slot <= MAX_SLOTS:
+            self.action_result = f"Invalid save slot (slots are 1 to {MAX_SLOTS})"
+            return
+        
+        # written by the saver thread; a failure shows up on the next save
+        error = self.saver.take_error()
+        state = self.export_state()
+        self.saver.submit(self.store.slot_path(slot), lambda: self.store.write(slot, state))
+        
+        if error is None:
+            self.action_result = f"Timeline state saved to slot {slot}"
+        else:
+            self.action_result = f"Timeline state saved to slot {slot} (the previous save failed: {error})"
+    
+    def load_game(self, slot=1):
+        """Load save `slot`. Returns whether it worked; action_result says why not."""
+        if not 1 <= slot <= MAX_SLOTS:
+            self.action_result = f"Invalid save slot (slots are 1 to {MAX_SLOTS})"
+            return False
+        
+        try:
+            self.saver.flush()
+            data = self.store.load(slot)
             
-            self.action_result = "Timeline state loaded successfully"
+            self.import_state(data)
+            self.action_result = f"Timeline state loaded from slot {slot}"
+            return True
+        except FileNotFoundError:
+            self.action_result = f"No timeline saved in slot {slot}"
         except Exception as e:
-            print(f"Error loading game: {e}")
-            self.action_result = "Failed to load timeline state"
+            self.action_result = f"Failed to load timeline state: {e}"
+        return False
     
     def display_final_outcome(self):
         self.clear_screen()
         if self.win:
-            print(self.center_text("TIMELINE STABILIZED"))
-            print(self.center_text(f"Congratulations, {self.player_name}!"))
-            print("\n" * 2)
-            print(textwrap.fill("You successfully repaired the fabric of time, preventing the collapse of reality. The Chronos Institute records will forever remember your heroic efforts in preserving the timeline. History is once again flowing as it should, free from paradoxes and temporal corruption.", width=self.terminal_width - 4))
-            print("\n" * 2)
-            print(self.center_text(f"Paradoxes Resolved: {self.paradoxes_resolved}"))
-            print(self.center_text(f"Time Loops: {self.time_loops}"))
-            print(self.center_text(f"Final Stability: {self.timeline_stability}%"))
+            self.screen.write(self.center_text("TIMELINE STABILIZED"))
+            self.screen.write(self.center_text(f"Congratulations, {self.player_name}!"))
+            self.screen.write("\n" * 2)
+            self.screen.write(textwrap.fill("You successfully repaired the fabric of time, preventing the collapse of reality. The Chronos Institute records will forever remember your heroic efforts in preserving the timeline. History is once again flowing as it should, free from paradoxes and temporal corruption.", width=self.terminal_width - 4))
+            self.screen.write("\n" * 2)
+            self.screen.write(self.center_text(f"Paradoxes Resolved: {self.paradoxes_resolved}"))
+            self.screen.write(self.center_text(f"Time Loops: {self.time_loops}"))
+            self.screen.write(self.center_text(f"Final Stability: {self.timeline_stability}%"))
         else:
-            print(self.center_text("TIMELINE COLLAPSED"))
-            print(self.center_text(f"Mission failed, {self.player_name}"))
-            print("\n" * 2)
-            print(textwrap.fill("As the last threads of temporal integrity unravel, reality fragments into countless contradictory timelines. History ceases to have meaning as past, present, and future collapse into chaos. Your final moments are spent watching civilizations rise and fall in an instant before everything dissolves into the temporal void.", width=self.terminal_width - 4))
-            print("\n" * 2)
-            print(self.center_text(f"Resolved: {self.paradoxes_resolved}/{len(self.temporal_entities)} paradoxes"))
-            print(self.center_text(f"Final Stability: {self.timeline_stability}%"))
-        
-        print("\n" * 2)
-        print(self.center_text("Thank you for playing CHRONO-SYNC"))
-        print("\n" * 2)
+            self.screen.write(self.center_text("TIMELINE COLLAPSED"))
+            self.screen.write(self.center_text(f"Mission failed, {self.player_name}"))
+            self.screen.write("\n" * 2)
+            self.screen.write(textwrap.fill("As the last threads of temporal integrity unravel, reality fragments into countless contradictory timelines. History ceases to have meaning as past, present, and future collapse into chaos. Your final moments are spent watching civilizations rise and fall in an instant before everything dissolves into the temporal void.", width=self.terminal_width - 4))
+            self.screen.write("\n" * 2)
+            self.screen.write(self.center_text(f"Resolved: {self.paradoxes_resolved}/{len(self.temporal_entities)} paradoxes"))
+            self.screen.write(self.center_text(f"Final Stability: {self.timeline_stability}%"))
+        
+        self.screen.write("\n" * 2)
+        self.screen.write(self.center_text("Thank you for playing CHRONO-SYNC"))
+        self.screen.write("\n" * 2)
+        self.screen.flush()
 
 if __name__ == "__main__":
-    game = ChronoSyncGame()
-    game.start()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Chrono-Sync: Temporal Paradox Solver")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="read one action per line on stdin, write one JSON observation per line")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_SETTINGS), default="MEDIUM", help="--jsonl only")
+    parser.add_argument("--seed", type=int, default=None, help="--jsonl only")
+    parser.add_argument("--resume", type=int, nargs="?", const=1, metavar="SLOT",
+                        help="skip the menus and continue the game saved in SLOT (default 1)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="time turn phases and actions, and write them to FILE in the Prometheus text format")
+    args = parser.parse_args()
+    
+    metrics = None
+    if args.metrics:
+        from metrics import Metrics, instrument
+        metrics = Metrics()
+    try:
+        if args.jsonl:
+            import jsonl
+            jsonl.run(sys.stdin.fileno(), sys.stdout.buffer, args.difficulty, args.seed, metrics=metrics)
+        else:
+            game = ChronoSyncGame()
+            if metrics:
+                instrument(game, metrics, summary=True)
+            if args.resume is None:
+                game.start()
+            elif not game.resume(args.resume):
+                parser.exit(1, f"{game.action_result}\n")
+    finally:
+        if metrics:
+            metrics.write(args.metrics)
\ No newline at end of file
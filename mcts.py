@@ -0,0 +1,250 @@
+"""Monte Carlo tree search player, for difficulty tuning.
+
+The tree is open-loop: a node stands for a sequence of menu choices, not for
+one game state, since the same choices can lead to many states. Each
+iteration forks the root game, walks down the tree choosing actions by UCB1
+among those legal in the state it actually reached, adds one child, and
+finishes the game (or `horizon` more turns) with a fast rollout policy.
+
+The fork's RNG is reseeded from the node's seed and visit count before each
+action of the walk, and the rollout goes on drawing from it. That way the search never follows the real
+game's upcoming random draws, and a search with the same seed visits the
+same outcomes. Root parallelization runs independent searches with
+different seeds in a process pool and adds up their root statistics.
+
+A result is 1 for a win, 0 for a collapse, and half the fraction of
+paradoxes resolved when the rollout runs out of turns.
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from content import default_content
+from main import Action, ActionType, ChronoSyncGame, ERAS, FREQUENCY_SETTINGS
+from minigame import OptimalGuesser
+from policies import solver
+from streams import FastRandom, RandomStreams
+
+EXPLORATION = 1.0
+KINDS = {kind: i for i, kind in enumerate(ActionType)}
+
+
+def legal_actions(game):
+    """(kind, target) for every menu choice worth searching in this state."""
+    energy = game.chrono_energy
+    order = game.registry.discovery_order
+    actions = [(ActionType.RESOLVE, order[e] + 1) for e in game.present_entities()
+               if not e.paradox_resolved and energy >= e.paradox_value * 5]
+    if energy >= 15:
+        actions.append((ActionType.SCAN, None))
+    if energy >= 30:
+        actions.append((ActionType.STABILIZE, None))
+    if game.timeline_stability >= 40:
+        actions.append((ActionType.REST, None))
+
+    current = ERAS.index(game.current_era)
+    wanted = {e.time_period for e in game.registry.absent if not e.paradox_resolved}
+    for target, era in enumerate(ERAS):
+        if era in wanted and target != current and energy >= 25 + abs(target - current) * 5:
+            actions.append((ActionType.JUMP, target + 1))
+
+    present = game.present_entities()
+    for target, entity in enumerate(present, 1):
+        if entity.paradox_resolved and energy >= 20:
+            actions.append((ActionType.CONTAIN, target))
+            break
+    for target, npc in enumerate(game.era_npcs(), 1):
+        if npc.quest and npc.name not in game.completed_quests and npc.quest[2] in game.inventory:
+            actions.append((ActionType.NPC, target))
+    actions.append((ActionType.ANALYZE, None))
+    return actions
+
+
+def make_action(game, key):
+    kind, target = key
+    if kind is ActionType.RESOLVE:
+        return Action(kind, target, OptimalGuesser(*FREQUENCY_SETTINGS[game.difficulty]))
+    return Action(kind, target, accept=kind is ActionType.NPC)
+
+
+def describe(game, key):
+    kind, target = key
+    if kind is ActionType.RESOLVE:
+        return f"resolve {game.discovered_entities[target - 1].name}"
+    if kind is ActionType.JUMP:
+        return f"jump {ERAS[target - 1]}"
+    if kind is ActionType.CONTAIN:
+        return f"contain {game.present_entities()[target - 1].name}"
+    if kind is ActionType.NPC:
+        return f"quest {game.era_npcs()[target - 1].name}"
+    return kind.name.lower()
+
+
+def outcome(game, total):
+    if game.game_over:
+        return 1.0 if game.win else 0.0
+    return 0.5 * game.paradoxes_resolved / total
+
+
+class Node:
+    __slots__ = ("seed", "visits", "value", "children")
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}
+
+    def child(self, key):
+        node = self.children.get(key)
+        if node is None:
+            kind, target = key
+            seed = (self.seed * 1000003 + KINDS[kind] * 1009 + (target or 0)) & 0xFFFFFFFFFFFF
+            node = self.children[key] = Node(seed)
+        return node
+
+    def select(self, legal):
+        untried = [key for key in legal if key not in self.children]
+        if untried:
+            return untried[0]
+        log_visits = math.log(self.visits)
+        return max(legal, key=lambda key: self.children[key].ucb(log_visits))
+
+    def ucb(self, log_visits):
+        return self.value / self.visits + EXPLORATION * math.sqrt(log_visits / self.visits)
+
+
+def search(root_game, seed, rollouts=None, seconds=None, horizon=60, rollout_policy=solver):
+    """Search from a game; returns ({key: (visits, value)}, rollouts run)."""
+    total = len(root_game.temporal_entities)
+    root = Node(seed)
+    # every fork shares one fast generator for all its streams, reseeded at each node
+    rng = FastRandom(seed)
+    streams = RandomStreams.single(rng)
+    deadline = time.perf_counter() + seconds if seconds else None
+
+    done = 0
+    while (rollouts is None or done < rollouts) and (deadline is None or time.perf_counter() < deadline):
+        game = root_game.fork(streams)
+        node = root
+        path = [root]
+        while not game.game_over:
+            key = node.select(legal_actions(game))
+            expanded = key not in node.children
+            node = node.child(key)
+            path.append(node)
+            rng.seed(node.seed + node.visits)
+            game.step(make_action(game, key))
+            if expanded:
+                break
+
+        end = game.game_time + horizon
+        while not game.game_over and game.game_time < end:
+            game.step(rollout_policy(game))
+        result = outcome(game, total)
+        for visited in path:
+            visited.visits += 1
+            visited.value += result
+        done += 1
+    return {key: (node.visits, node.value) for key, node in root.children.items()}, done
+
+
+def search_state(state, seed, rollouts=None, seconds=None, horizon=60, rollout_policy=solver, content=None):
+    """search() from an exported game state, for worker processes."""
+    game = ChronoSyncGame(0, content or default_content())
+    game.import_state(state)
+    game.headless = True
+    return search(game, seed, rollouts, seconds, horizon, rollout_policy)
+
+
+class MCTSBot:
+    """A policy that plays the most visited root action of an MCTS search.
+
+    The budget is `rollouts` per move, or `seconds` per move when given.
+    With workers > 1 each worker searches the full budget with its own seed
+    (root parallelization). `stats` describes the last search: rollouts,
+    rollouts per second, and visits and mean value per root action.
+    """
+    def __init__(self, rollouts=1000, seconds=None, horizon=60, workers=1, seed=0):
+        self.rollouts = rollouts
+        self.seconds = seconds
+        self.horizon = horizon
+        self.workers = workers
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.pool = None
+        self.stats = {}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["pool"] = None
+        return state
+
+    def reset(self, seed):
+        self.rng.seed(seed)
+
+    def __call__(self, game):
+        started = time.perf_counter()
+        budget = (None if self.seconds else self.rollouts, self.seconds, self.horizon, solver)
+        seeds = [self.rng.getrandbits(48) for _ in range(self.workers)]
+
+        if self.workers > 1:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            state = game.export_state()
+            content = None if game.content is default_content() else game.content
+            results = list(self.pool.map(search_state, [state] * self.workers, seeds,
+                                         *[[b] * self.workers for b in budget + (content,)]))
+        else:
+            results = [search(game, seeds[0], *budget)]
+
+        totals = {}
+        for children, done in results:
+            for key, (visits, value) in children.items():
+                seen = totals.setdefault(key, [0, 0.0])
+                seen[0] += visits
+                seen[1] += value
+        rollouts = sum(done for children, done in results)
+        elapsed = time.perf_counter() - started
+        best = max(totals, key=lambda key: totals[key][0])
+        self.stats = {
+            "rollouts": rollouts,
+            "elapsed": elapsed,
+            "rollouts_per_sec": rollouts / elapsed if elapsed else 0.0,
+            "actions": {describe(game, key): {"visits": visits, "value": value / visits}
+                        for key, (visits, value) in sorted(totals.items(), key=lambda item: -item[1][0])}
+        }
+        return make_action(game, best)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from main import DIFFICULTY_SETTINGS
+
+    parser = argparse.ArgumentParser(description="Play one seeded game with the MCTS bot")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_SETTINGS), default="HARD")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rollouts", type=int, default=500, help="rollouts per move")
+    parser.add_argument("--seconds", type=float, default=None, help="time per move instead of a rollout count")
+    parser.add_argument("--workers", type=int, default=1, help="processes searching each move (root parallelization)")
+    args = parser.parse_args()
+
+    game = ChronoSyncGame(args.seed)
+    game.reset(args.difficulty, seed=args.seed)
+    bot = MCTSBot(args.rollouts, args.seconds, workers=args.workers, seed=args.seed)
+    while not game.game_over:
+        action = bot(game)
+        move, stats = next(iter(bot.stats["actions"].items()))
+        print(f"turn {game.game_time:>3}  stability {game.timeline_stability:>3}%  energy {game.chrono_energy:>3}  "
+              f"{move:<34} visits {stats['visits']:>5}  value {stats['value']:.3f}  "
+              f"{bot.stats['rollouts_per_sec']:.0f} rollouts/s")
+        game.step(action)
+    bot.close()
+    print("Timeline restored." if game.win else "Timeline collapsed.")
@@ -0,0 +1,210 @@
+"""Opt-in timing of a game's hot paths.
+
+instrument(game, metrics) switches one game to a subclass of its class that
+times the phases of a turn (decay, update_events, add_random_event,
+auto-discovery, and the whole turn), display() and every action, into a
+Metrics object that any number of games can share. Games that are not
+instrumented run the original methods with no checks at all, and forks of
+an instrumented game are plain games again.
+
+Action times leave out the time spent waiting for the player: prompts in
+the terminal and the guesses a host sends into play(). Metrics can be
+written as a Prometheus text file or summarised at the end of the game.
+"""
+import bisect
+import functools
+import time
+
+from saver import write_atomic
+
+# histogram bucket bounds in seconds, 10 us to 1 s
+BUCKETS = (1e-05, 2.5e-05, 5e-05, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HELP = {
+    "phase": "Time spent in each phase of a turn.",
+    "action": "Time spent handling each player action, not counting waits for the player.",
+    "games": "Games that ended, by outcome.",
+    "events": "Temporal events started, by kind."
+}
+LABELS = {"games": "outcome", "events": "kind"}
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Estimated q-quantile, interpolated within its bucket as Prometheus does."""
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(BUCKETS, self.counts):
+            if n and seen + n >= rank:
+                return min(lower + (bound - lower) * (rank - seen) / n, self.max)
+            seen += n
+            lower = bound
+        return self.max
+
+
+class Metrics:
+    """Latency histograms and counters, each keyed by (metric, label)."""
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, metric, label, seconds):
+        histogram = self.histograms.get((metric, label))
+        if histogram is None:
+            histogram = self.histograms[metric, label] = Histogram()
+        histogram.observe(seconds)
+
+    def count(self, metric, label, n=1):
+        self.counters[metric, label] = self.counters.get((metric, label), 0) + n
+
+    def timed(self, label, function):
+        start = time.perf_counter()
+        try:
+            return function()
+        finally:
+            self.observe("phase", label, time.perf_counter() - start)
+
+    def prometheus(self):
+        """The metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in sorted({metric for metric, label in self.histograms}):
+            name = f"chrono_sync_{metric}_seconds"
+            lines.append(f"# HELP {name} {HELP.get(metric, metric)}")
+            lines.append(f"# TYPE {name} histogram")
+            for (kind, label), histogram in sorted(self.histograms.items()):
+                if kind != metric:
+                    continue
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{metric}="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{metric}="{label}"}} {histogram.sum:.9f}')
+                lines.append(f'{name}_count{{{metric}="{label}"}} {histogram.count}')
+        for metric in sorted({metric for metric, label in self.counters}):
+            name = f"chrono_sync_{metric}_total"
+            lines.append(f"# HELP {name} {HELP.get(metric, metric)}")
+            lines.append(f"# TYPE {name} counter")
+            for (kind, label), value in sorted(self.counters.items()):
+                if kind == metric:
+                    lines.append(f'{name}{{{LABELS.get(metric, "label")}="{label}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write prometheus() to `path`, replacing the old file in one step."""
+        write_atomic(path, self.prometheus().encode("utf-8"))
+
+    def summary(self):
+        """Text lines with count, mean, p50, p99 and max per phase and action."""
+        lines = [f"{'':<26}{'COUNT':>7}{'MEAN':>10}{'P50':>10}{'P99':>10}{'MAX':>10}"]
+        for (metric, label), h in sorted(self.histograms.items()):
+            lines.append(f"{metric + ' ' + label:<26}{h.count:>7}{format_seconds(h.sum / h.count):>10}"
+                         f"{format_seconds(h.quantile(0.5)):>10}{format_seconds(h.quantile(0.99)):>10}"
+                         f"{format_seconds(h.max):>10}")
+        return lines
+
+
+def format_seconds(seconds):
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}us"
+    return f"{seconds * 1000:.1f}ms"
+
+
+@functools.lru_cache(maxsize=None)
+def instrumented(cls):
+    """A subclass of the game class `cls` whose hot paths report to self.metrics."""
+    clock = time.perf_counter
+
+    class Instrumented(cls):
+        def advance_turn(self):
+            beat_advanced = self.metrics.timed("turn", super().advance_turn)
+            if self.game_over:
+                self.metrics.count("games", "win" if self.win else "collapse")
+            return beat_advanced
+
+        def decay(self):
+            return self.metrics.timed("decay", super().decay)
+
+        def update_events(self):
+            return self.metrics.timed("update_events", super().update_events)
+
+        def add_random_event(self):
+            self.metrics.timed("add_random_event", super().add_random_event)
+            kind = next(reversed(self.schedule.running)).template.kind
+            self.metrics.count("events", kind.name if kind else "custom")
+
+        def auto_discover(self):
+            return self.metrics.timed("auto_discovery", super().auto_discover)
+
+        def display(self):
+            return self.metrics.timed("display", super().display)
+
+        def prompt(self, text=""):
+            start = clock()
+            try:
+                return super().prompt(text)
+            finally:
+                self.waited += clock() - start
+
+        def get_player_action(self):
+            start = clock()
+            waited = self.waited
+            super().get_player_action()
+            kind = self.recorded.kind if self.recorded else None
+            self.metrics.observe("action", kind.name.lower() if kind else "invalid",
+                                 clock() - start - (self.waited - waited))
+
+        def perform(self, action):
+            # only the time spent running counts, not the waits for guesses
+            steps = super().perform(action)
+            elapsed = 0.0
+            request = None
+            try:
+                while True:
+                    start = clock()
+                    try:
+                        request = steps.send(request)
+                    finally:
+                        elapsed += clock() - start
+                    request = yield request
+            except StopIteration:
+                pass
+            finally:
+                kind = action.kind
+                self.metrics.observe("action", kind.name.lower() if kind else "invalid", elapsed)
+
+        def display_final_outcome(self):
+            super().display_final_outcome()
+            if self.metrics_summary:
+                self.screen.write(self.center_text("PERFORMANCE SUMMARY"))
+                for line in self.metrics.summary():
+                    self.screen.write(line)
+                self.screen.flush()
+
+    Instrumented.__name__ = Instrumented.__qualname__ = f"Instrumented{cls.__name__}"
+    return Instrumented
+
+
+def instrument(game, metrics=None, summary=False):
+    """Start timing `game` into `metrics` (a new Metrics by default) and return it.
+    With summary=True the final outcome screen ends with a timing summary."""
+    game.metrics = metrics or Metrics()
+    game.metrics_summary = summary
+    game.waited = 0.0
+    game.__class__ = instrumented(type(game))
+    return game.metrics
@@ -0,0 +1,78 @@
+"""Optimal play for the paradox frequency minigame.
+
+The target frequency is uniform over 1..max_freq. After each wrong guess the
+player learns only whether it was close (within 2) or way off, so the best
+strategy is a decision tree: a first guess, then a subtree for each kind of
+feedback. decision_tree() finds the tree that hits the most targets, by
+exhaustive search over the sets of targets still possible (at most 2^10 for
+the game's ranges). Trees are cached per (max_freq, attempts).
+
+A node is (guess, close subtree, far subtree); None means nothing is left
+to guess.
+"""
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def decision_tree(max_freq, attempts):
+    """(tree, targets it finds) for the best strategy with `attempts` guesses over 1..max_freq."""
+    near = [0] * (max_freq + 1)
+    for guess in range(1, max_freq + 1):
+        for target in range(max(1, guess - 2), min(max_freq, guess + 2) + 1):
+            if target != guess:
+                near[guess] |= 1 << (target - 1)
+
+    memo = {}
+
+    def best(candidates, attempts):
+        if not candidates or not attempts:
+            return None, 0
+        if (candidates, attempts) in memo:
+            return memo[candidates, attempts]
+
+        found = (None, -1)
+        # a guess that might still be right is tried before equally good probes
+        order = sorted(range(1, max_freq + 1), key=lambda guess: not candidates >> (guess - 1) & 1)
+        for guess in order:
+            bit = 1 << (guess - 1)
+            close_tree, close_wins = best(candidates & near[guess], attempts - 1)
+            far_tree, far_wins = best(candidates & ~near[guess] & ~bit, attempts - 1)
+            wins = bool(candidates & bit) + close_wins + far_wins
+            if wins > found[1]:
+                found = ((guess, close_tree, far_tree), wins)
+        memo[candidates, attempts] = found
+        return found
+
+    return best((1 << max_freq) - 1, attempts)
+
+
+def success_probability(max_freq, attempts):
+    """Chance that optimal play finds the target."""
+    return decision_tree(max_freq, attempts)[1] / max_freq
+
+
+class OptimalGuesser:
+    """A guesses callable for ChronoSyncGame.attempt_resolution (and
+    Action.guesses) that follows the optimal decision tree. It starts over
+    whenever it is asked for a first guess, so one instance can be reused.
+    """
+    def __init__(self, max_freq, attempts):
+        self.max_freq = max_freq
+        self.attempts = attempts
+        self.tree = decision_tree(max_freq, attempts)[0]
+        self.node = self.tree
+
+    def __call__(self, attempts, max_freq, feedback):
+        if attempts == self.attempts:
+            self.node = self.tree
+        elif self.node is not None:
+            self.node = self.node[1] if feedback == "close" else self.node[2]
+        return self.node[0] if self.node is not None else None
+
+
+if __name__ == "__main__":
+    from main import FREQUENCY_SETTINGS
+
+    for difficulty, (max_freq, attempts) in FREQUENCY_SETTINGS.items():
+        print(f"{difficulty:<7} 1-{max_freq:<3} {attempts} attempts: "
+              f"optimal {success_probability(max_freq, attempts):.3f}, blind {attempts / max_freq:.3f}")
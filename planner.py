@@ -0,0 +1,288 @@
+"""Expectimax advisor: the best next action for a game in progress.
+
+The planner searches a model of the game built from its rules: what scan,
+analyze, resolve, jump, contain, stabilize and rest cost and the chances of
+each outcome (minigame odds are those of optimal play), then the per-turn
+decay, regeneration and event spawns. Small random amounts (decay, rest and
+stabilize gains, event deltas) are folded into their expected values;
+events that add entities or change paradox values, the free discovery at
+the end of a turn, items and NPCs are not modelled.
+
+A model state is stability, energy, the current era and bit masks of the
+entities that are discovered, present and resolved. key() packs it into one
+int, with stability and energy bucketed, and the value found for each
+(key, depth) is kept in a bounded LRU transposition table. The table lives
+as long as the Planner, so states met again, in this search or in later
+turns, are not searched twice.
+
+Values are discounted per action, so of two lines that win the shorter is
+preferred. Each search deepens one action at a time until its time budget
+runs out (45 ms by default, so answers arrive within 50 ms), and the answer
+comes from the deepest search that finished, or from the actions scored so
+far when not even the one-action search finished in time.
+"""
+import time
+from collections import OrderedDict
+
+from main import Action, ActionType, ERAS, EVENT_EFFECTS, FREQUENCY_SETTINGS, REST_SETTINGS
+from minigame import OptimalGuesser, success_probability
+
+BUCKET = 5
+SPAWN_CHANCE = 0.3
+SCAN_DISCOVERY = 0.4
+JUMP_INSTABILITY = 0.3 * 7.5
+DISCOUNT = 0.98
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Model:
+    """The rules of one game as transitions between compact states
+    (stability, energy, era, discovered, present, resolved)."""
+    def __init__(self, game):
+        entities = game.temporal_entities
+        self.n = len(entities)
+        self.all = (1 << self.n) - 1
+        self.paradox = [e.paradox_value for e in entities]
+        self.era_masks = [0] * len(ERAS)
+        for i, e in enumerate(entities):
+            if e.time_period in ERAS:
+                self.era_masks[ERAS.index(e.time_period)] |= 1 << i
+
+        self.decay = (1 + game.stability_decay) / 2
+        self.success = success_probability(*FREQUENCY_SETTINGS[game.difficulty])
+        energy_range, cost_range = REST_SETTINGS[game.difficulty]
+        self.rest_energy = sum(energy_range) / 2
+        self.rest_cost = sum(cost_range) / 2
+        pool = game.content.events
+        effects = [EVENT_EFFECTS.get(template.kind) for template in pool]
+        self.event_stability = SPAWN_CHANCE * sum(e.stability for e in effects if e) / len(pool)
+        self.event_energy = SPAWN_CHANCE * sum(e.energy for e in effects if e) / len(pool)
+        self.context = (game.difficulty, tuple(self.paradox), tuple(self.era_masks))
+
+    def start(self, game):
+        disc = pres = res = 0
+        for i, e in enumerate(game.temporal_entities):
+            if game.registry.is_discovered(e):
+                disc |= 1 << i
+            if e.present:
+                pres |= 1 << i
+            if e.paradox_resolved:
+                res |= 1 << i
+        return (game.timeline_stability, game.chrono_energy, ERAS.index(game.current_era), disc, pres, res)
+
+    def key(self, state):
+        stab, energy, era, disc, pres, res = state
+        n = self.n
+        return (min(31, max(0, int(stab) // BUCKET)) | min(31, int(energy) // BUCKET) << 5 | era << 10 |
+                disc << 14 | pres << (14 + n) | res << (14 + 2 * n))
+
+    def world(self, stab, energy, era, disc, pres, res):
+        """The end of the turn: decay, regeneration and the expected event."""
+        stab = max(0, min(100, stab - self.decay)) + self.event_stability
+        energy = min(100, energy + 1.5) + self.event_energy
+        return (stab, energy, era, disc, pres, res)
+
+    def estimate(self, state):
+        """Heuristic value in (-1, 1) of a state the search does not expand."""
+        stab, energy, era, disc, pres, res = state
+        resolved = bin(res).count("1") / self.n
+        ready = bin(disc & pres & ~res).count("1") / self.n
+        found = bin(disc).count("1") / self.n
+        return -1 + 2 * (0.5 * resolved + 0.08 * ready + 0.04 * found +
+                         0.28 * min(stab, 100) / 100 + 0.1 * min(energy, 100) / 100)
+
+    def moves(self, state):
+        """[(move, [(probability, next state), ...]), ...] for every sensible action."""
+        stab, energy, era, disc, pres, res = state
+        world = self.world
+        moves = []
+
+        for i in bits(disc & pres & ~res):
+            cost = self.paradox[i] * 5
+            if energy >= cost:
+                outcomes = [(self.success, world(stab + 15, min(100, energy - cost + 15), era, disc, pres, res | 1 << i))]
+                if self.success < 1:
+                    outcomes.append((1 - self.success,
+                                     world(stab - 8, energy - self.paradox[i] * 2, era, disc, pres, res)))
+                moves.append(((ActionType.RESOLVE, i), outcomes))
+
+        if energy >= 30:
+            moves.append(((ActionType.STABILIZE, None), [(1, world(min(100, stab + 20), energy - 30, era, disc, pres, res))]))
+        if stab >= 40:
+            moves.append(((ActionType.REST, None),
+                          [(1, world(stab - self.rest_cost, min(100, energy + self.rest_energy), era, disc, pres, res))]))
+
+        for target, mask in enumerate(self.era_masks):
+            cost = 25 + abs(target - era) * 5
+            if target != era and disc & ~pres & ~res & mask and energy >= cost:
+                moves.append(((ActionType.JUMP, target),
+                              [(1, world(stab - JUMP_INSTABILITY, energy - cost, target, disc, pres | disc & mask, res))]))
+
+        contained = disc & pres & res
+        if contained and energy >= 20:
+            i = next(bits(contained))
+            moves.append(((ActionType.CONTAIN, i), [(1, world(stab + 5, energy - 20, era, disc, pres & ~(1 << i), res))]))
+
+        hidden = self.all & ~disc
+        absent = disc & ~pres
+        if energy >= 15:
+            found = SCAN_DISCOVERY if hidden else 0
+            outcomes = [(found / bin(hidden).count("1"), world(stab, energy - 15, era, disc | 1 << i, pres, res))
+                        for i in bits(hidden)]
+            if absent:
+                share = (1 - found) / bin(absent).count("1")
+                outcomes += [(share, world(stab, energy - 15, era, disc, pres | 1 << i, res)) for i in bits(absent)]
+            else:
+                outcomes.append((1 - found, world(stab, energy - 15, era, disc, pres, res)))
+            moves.append(((ActionType.SCAN, None), outcomes))
+
+        if hidden:
+            share = 1 / bin(hidden).count("1")
+            outcomes = [(share, world(stab, energy, era, disc | 1 << i, pres, res)) for i in bits(hidden)]
+        else:
+            outcomes = [(1, world(stab, energy, era, disc, pres, res))]
+        moves.append(((ActionType.ANALYZE, None), outcomes))
+        return moves
+
+
+class Planner:
+    """Advises the next action for a game; also usable as a policy (planner(game) -> Action)."""
+    def __init__(self, budget=0.045, max_depth=8, table_size=200000):
+        self.budget = budget
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.table = OrderedDict()
+        self.contexts = {}
+        self.stats = {}
+
+    def __getstate__(self):
+        # policies are pickled for worker processes; they start with an empty table
+        state = dict(self.__dict__)
+        state["table"] = OrderedDict()
+        state["contexts"] = {}
+        return state
+
+    def advise(self, game):
+        """The best next Action; details of the search are left in `stats`."""
+        started = time.perf_counter()
+        model = Model(game)
+        state = model.start(game)
+        context = self.contexts.setdefault(model.context, len(self.contexts))
+        self.nodes = self.hits = 0
+
+        deadline = started + self.budget
+        scored = None
+        depth = 0
+        while depth < self.max_depth:
+            results = []
+            try:
+                self.search_root(model, context, state, depth + 1, deadline, results)
+            except SearchTimeout:
+                # without a finished search, go with the actions scored so far
+                if scored is None:
+                    scored = results
+                break
+            scored = results
+            depth += 1
+
+        move, value = max(scored, key=lambda item: item[1])
+        self.stats = {
+            "depth": depth,
+            "nodes": self.nodes,
+            "table_hits": self.hits,
+            "table_size": len(self.table),
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "values": {self.describe(game, m): v for m, v in scored}
+        }
+        return self.action(game, move)
+
+    __call__ = advise
+
+    def search_root(self, model, context, state, depth, deadline, results):
+        """Append (move, value) to `results` for each move, checking the deadline before
+        every move but the first."""
+        for move, outcomes in model.moves(state):
+            if results and time.perf_counter() > deadline:
+                raise SearchTimeout()
+            results.append((move, DISCOUNT * sum(p * self.value(model, context, s, depth - 1, deadline)
+                                                 for p, s in outcomes)))
+
+    def value(self, model, context, state, depth, deadline):
+        if state[0] <= 0:
+            return -1.0
+        if state[5] == model.all:
+            return 1.0
+        if depth == 0:
+            return model.estimate(state)
+
+        key = (model.key(state) << 16 | context) << 4 | depth
+        table = self.table
+        if key in table:
+            self.hits += 1
+            table.move_to_end(key)
+            return table[key]
+
+        self.nodes += 1
+        if deadline is not None and time.perf_counter() > deadline:
+            raise SearchTimeout()
+
+        best = DISCOUNT * max(sum(p * self.value(model, context, s, depth - 1, deadline) for p, s in outcomes)
+                   for move, outcomes in model.moves(state))
+        table[key] = best
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+        return best
+
+    def action(self, game, move):
+        kind, index = move
+        if kind is ActionType.RESOLVE:
+            entity = game.temporal_entities[index]
+            return Action(kind, game.registry.discovery_order[entity] + 1,
+                          OptimalGuesser(*FREQUENCY_SETTINGS[game.difficulty]))
+        if kind is ActionType.CONTAIN:
+            entity = game.temporal_entities[index]
+            return Action(kind, game.present_entities().index(entity) + 1)
+        if kind is ActionType.JUMP:
+            return Action(kind, index + 1)
+        return Action(kind)
+
+    def describe(self, game, move):
+        kind, index = move
+        name = kind.name.lower()
+        if kind is ActionType.JUMP:
+            return f"{name} {ERAS[index]}"
+        if index is not None:
+            return f"{name} {game.temporal_entities[index].name}"
+        return name
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from main import ChronoSyncGame, DIFFICULTY_SETTINGS
+
+    parser = argparse.ArgumentParser(description="Play one seeded game on the planner's advice")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_SETTINGS), default="HARD")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = ChronoSyncGame(args.seed)
+    game.reset(args.difficulty, seed=args.seed)
+    planner = Planner()
+    while not game.game_over:
+        action = planner.advise(game)
+        move = max(planner.stats["values"], key=planner.stats["values"].get)
+        print(f"turn {game.game_time:>3}  stability {game.timeline_stability:>3}%  energy {game.chrono_energy:>3}  "
+              f"{move:<34} depth {planner.stats['depth']}  {planner.stats['elapsed_ms']:.1f} ms")
+        game.step(action)
+    print("Timeline restored." if game.registry.all_resolved() and game.timeline_stability > 0 else "Timeline collapsed.")
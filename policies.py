@@ -0,0 +1,122 @@
+"""Scripted players for the headless engine.
+
+A policy is any callable taking a ChronoSyncGame and returning the Action to
+play this turn. Policies that keep state or need their own randomness may also
+define reset(seed), which is called before every game. Policies must be
+picklable (module-level functions or instances of module-level classes) so the
+tournament runner can ship them to worker processes.
+"""
+import random
+
+from main import Action, ActionType, ERAS, FREQUENCY_SETTINGS
+
+
+def resolvable(game):
+    """(paradox value, 1-based selection) for every paradox the player can attempt now."""
+    order = game.registry.discovery_order
+    return [(e.paradox_value, order[e] + 1) for e in game.registry.present
+            if not e.paradox_resolved and game.chrono_energy >= e.paradox_value * 5]
+
+
+def sweep_guesses(game):
+    max_freq, attempts = FREQUENCY_SETTINGS[game.difficulty]
+    return list(range(1, attempts + 1))
+
+
+def scan_useful(game):
+    return bool(game.registry.hidden or game.registry.absent)
+
+
+def greedy_action(game):
+    """Resolve the cheapest present paradox it can afford, stabilize when the
+    timeline is failing, rest when stability is above 60% and energy below 30
+    (the readme's advice), scan while there is something to find, and
+    otherwise analyze.
+    """
+    eligible = resolvable(game)
+    if eligible:
+        return Action(ActionType.RESOLVE, target=min(eligible)[1], guesses=sweep_guesses(game))
+
+    if game.timeline_stability < 40 and game.chrono_energy >= 30:
+        return Action(ActionType.STABILIZE)
+    if game.timeline_stability > 60 and game.chrono_energy < 30:
+        return Action(ActionType.REST)
+
+    if game.chrono_energy >= 15 and scan_useful(game):
+        return Action(ActionType.SCAN)
+    return Action(ActionType.ANALYZE)
+
+
+def rest_first(game):
+    """The readme's energy advice taken literally: rest before anything else
+    whenever stability is above 60% and energy below 30.
+    """
+    if game.timeline_stability > 60 and game.chrono_energy < 30:
+        return Action(ActionType.REST)
+
+    eligible = resolvable(game)
+    if eligible:
+        return Action(ActionType.RESOLVE, target=min(eligible)[1], guesses=sweep_guesses(game))
+
+    if game.chrono_energy >= 15 and scan_useful(game):
+        return Action(ActionType.SCAN)
+    return Action(ActionType.ANALYZE)
+
+
+def solver(game):
+    """greedy_action, but every affordable paradox is resolved at once with
+    optimal frequency guesses (the auto-resolve action)."""
+    if resolvable(game):
+        return Action(ActionType.AUTO_RESOLVE)
+    return greedy_action(game)
+
+
+def era_hopper(game):
+    """Jump to the native era of absent unresolved entities instead of scanning for them."""
+    eligible = resolvable(game)
+    if eligible:
+        return Action(ActionType.RESOLVE, target=min(eligible)[1], guesses=sweep_guesses(game))
+
+    if game.timeline_stability < 40 and game.chrono_energy >= 30:
+        return Action(ActionType.STABILIZE)
+
+    current = ERAS.index(game.current_era)
+    for entity in game.registry.absent:
+        if entity.paradox_resolved or entity.time_period not in ERAS:
+            continue
+        target = ERAS.index(entity.time_period)
+        if target != current and game.chrono_energy >= 25 + abs(target - current) * 5:
+            return Action(ActionType.JUMP, target=target + 1)
+
+    if game.timeline_stability > 60 and game.chrono_energy < 30:
+        return Action(ActionType.REST)
+    if game.chrono_energy >= 15 and scan_useful(game):
+        return Action(ActionType.SCAN)
+    return Action(ActionType.ANALYZE)
+
+
+class RandomPolicy:
+    """Uniformly random menu choices; a baseline every strategy should beat."""
+    kinds = [kind for kind in ActionType if kind is not ActionType.QUIT and kind is not ActionType.SAVE_LOAD]
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def reset(self, seed):
+        self.rng.seed(seed)
+
+    def __call__(self, game):
+        max_freq, attempts = FREQUENCY_SETTINGS[game.difficulty]
+        return Action(self.rng.choice(self.kinds),
+                      target=self.rng.randint(1, len(ERAS)),
+                      guesses=[self.rng.randint(1, max_freq) for _ in range(attempts)],
+                      accept=True)
+
+
+POLICIES = {
+    "greedy": greedy_action,
+    "rest_first": rest_first,
+    "era_hopper": era_hopper,
+    "solver": solver,
+    "random": RandomPolicy()
+}
@@ -0,0 +1,180 @@
+"""Indexed bookkeeping for the temporal entities of one game.
+
+The game used to answer "which entities are hidden / absent / present /
+from this era / unresolved" by filtering its entity lists every time, which
+grows with every Reality Echo clone. EntityRegistry keeps those answers as
+sets that are updated whenever an entity changes state, so each lookup costs
+O(1) (or O(answer) when a list is needed). All state changes to entities in
+the timeline must go through the registry.
+"""
+
+
+class IndexedSet:
+    """A set with O(1) add, remove and uniform random choice."""
+    def __init__(self, items=()):
+        self.items = []
+        self.index = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.index:
+            self.index[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        i = self.index.pop(item, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if last is not item:
+            self.items[i] = last
+            self.index[last] = i
+
+    def choice(self, rng):
+        return rng.choice(self.items)
+
+    def copy(self, copies):
+        """The same set, in the same order, of each item's counterpart in `copies`."""
+        other = IndexedSet.__new__(IndexedSet)
+        other.items = list(map(copies.__getitem__, self.items))
+        other.index = dict(zip(other.items, range(len(other.items))))
+        return other
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class EntityRegistry:
+    """Every entity in the timeline plus indexes over their state.
+
+    `entities` and `discovered` are ordered lists (timeline order and
+    discovery order, which is what the UI shows); the remaining indexes are
+    unordered.
+    """
+    def __init__(self, entities=()):
+        self.entities = []
+        self.discovered = []
+        self.members = set()
+        self.discovery_order = {}
+        self.hidden = IndexedSet()
+        self.absent = IndexedSet()
+        self.present = set()
+        self.unresolved = set()
+        self.discovered_by_era = {}
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity, discovered=False):
+        """Put an entity into the timeline, keeping its present/resolved flags."""
+        if entity in self.members:
+            return
+        self.entities.append(entity)
+        self.members.add(entity)
+        self.hidden.add(entity)
+        if not entity.paradox_resolved:
+            self.unresolved.add(entity)
+        if discovered:
+            self.discover(entity)
+
+    def discover(self, entity):
+        if entity in self.discovery_order:
+            return
+        self.hidden.discard(entity)
+        self.discovery_order[entity] = len(self.discovered)
+        self.discovered.append(entity)
+        self.discovered_by_era.setdefault(entity.time_period, []).append(entity)
+        if entity.present:
+            self.present.add(entity)
+        else:
+            self.absent.add(entity)
+
+    def set_present(self, entity, present=True):
+        entity.present = present
+        if entity in self.discovery_order:
+            if present:
+                self.absent.discard(entity)
+                self.present.add(entity)
+            else:
+                self.present.discard(entity)
+                self.absent.add(entity)
+
+    def resolve(self, entity):
+        entity.paradox_resolved = True
+        self.unresolved.discard(entity)
+
+    def is_discovered(self, entity):
+        return entity in self.discovery_order
+
+    def random_hidden(self, rng):
+        return self.hidden.choice(rng) if self.hidden else None
+
+    def random_absent(self, rng):
+        """A discovered entity that is not currently present, or None."""
+        return self.absent.choice(rng) if self.absent else None
+
+    def present_entities(self):
+        """Discovered entities that are present, in discovery order."""
+        return sorted(self.present, key=self.discovery_order.__getitem__)
+
+    def index_order(self, position):
+        """Iteration order of the hidden and absent indexes (random picks depend on it),
+        as positions given by the `position` mapping."""
+        return {"hidden": [position[e] for e in self.hidden], "absent": [position[e] for e in self.absent]}
+
+    def restore(self, entities, discovered, order=None):
+        """Bulk-load a saved timeline in one pass.
+
+        `entities` is the timeline in order, `discovered` the positions of the
+        discovered ones in discovery order and `order` what index_order
+        returned when it was saved (without it the indexes get a fresh order).
+        """
+        self.__init__()
+        self.entities = list(entities)
+        self.members = set(self.entities)
+        self.unresolved = {entity for entity in self.entities if not entity.paradox_resolved}
+        self.discovered = [self.entities[i] for i in dict.fromkeys(discovered)]
+        self.discovery_order = {entity: i for i, entity in enumerate(self.discovered)}
+        for entity in self.discovered:
+            self.discovered_by_era.setdefault(entity.time_period, []).append(entity)
+        self.present = {entity for entity in self.discovered if entity.present}
+
+        if order is not None:
+            self.hidden = IndexedSet(self.entities[i] for i in order["hidden"])
+            self.absent = IndexedSet(self.entities[i] for i in order["absent"])
+        else:
+            self.hidden = IndexedSet(e for e in self.entities if e not in self.discovery_order)
+            self.absent = IndexedSet(e for e in self.discovered if not e.present)
+
+    def copy(self, copies):
+        """The same registry over copies of its entities; `copies` maps each entity to its copy."""
+        copy = copies.__getitem__
+        other = EntityRegistry.__new__(EntityRegistry)
+        other.entities = list(map(copy, self.entities))
+        other.discovered = list(map(copy, self.discovered))
+        other.members = set(other.entities)
+        other.discovery_order = dict(zip(other.discovered, range(len(other.discovered))))
+        other.hidden = self.hidden.copy(copies)
+        other.absent = self.absent.copy(copies)
+        other.present = set(map(copy, self.present))
+        other.unresolved = set(map(copy, self.unresolved))
+        other.discovered_by_era = {era: list(map(copy, entities)) for era, entities in self.discovered_by_era.items()}
+        return other
+
+    def discovered_in_era(self, era):
+        return self.discovered_by_era.get(era, [])
+
+    def all_resolved(self):
+        return not self.unresolved
+
+    def __contains__(self, entity):
+        return entity in self.members
+
+    def __len__(self):
+        return len(self.entities)
@@ -0,0 +1,209 @@
+"""In-process terminal output for the interactive game.
+
+Screens are composed into a frame buffer and written with a single call when
+the game next needs input, instead of clearing the terminal through a shell.
+On ANSI-capable terminals each new frame is compared with the one already on
+screen and only the rows that changed are rewritten, with the cursor moved
+straight to them; everything below the new frame is erased. That keeps the
+bytes sent per turn small on serial consoles and high-latency links.
+"""
+import os
+import sys
+
+CURSOR_HOME = "\x1b[H"
+ERASE_LINE = "\x1b[K"
+ERASE_BELOW = "\x1b[J"
+INSERT_LINES = "\x1b[{}L"
+DELETE_LINES = "\x1b[{}M"
+
+
+def supports_ansi(stream):
+    if not hasattr(stream, "isatty") or not stream.isatty():
+        return False
+    term = os.environ.get("TERM", "")
+    if term == "dumb":
+        return False
+    if os.name == "nt":
+        # legacy Windows consoles only understand escapes under a modern host
+        return bool(term or os.environ.get("WT_SESSION") or os.environ.get("ANSICON"))
+    return True
+
+
+def terminal_size(stream):
+    """(columns, lines) of the terminal `stream` writes to, with COLUMNS and
+    LINES taking precedence as in shutil.get_terminal_size (which is not
+    used because importing shutil slows down startup)."""
+    try:
+        size = list(os.get_terminal_size(stream.fileno()))
+    except (AttributeError, ValueError, OSError):
+        size = [80, 24]
+    for i, name in enumerate(("COLUMNS", "LINES")):
+        value = os.environ.get(name, "")
+        if value.isdigit() and int(value) > 0:
+            size[i] = int(value)
+    return size[0] or 80, size[1] or 24
+
+
+def move_to(row, column=1):
+    return f"\x1b[{row};{column}H"
+
+
+def common_prefix(a, b):
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class TerminalRenderer:
+    """Buffers text for one screen and flushes it to the terminal in one write.
+
+    `mode` is "ansi" (incremental redraw), "plain" (frames are separated by a
+    blank line, for dumb terminals and pipes) or "legacy" (the platform clear
+    command, for old Windows consoles). It is detected from the stream when
+    not given. `size` pins the terminal size; otherwise it is queried on every
+    frame.
+    """
+    def __init__(self, stream=None, mode=None, size=None):
+        self.stream = stream or sys.stdout
+        if mode is None:
+            if supports_ansi(self.stream):
+                mode = "ansi"
+            elif os.name == "nt" and hasattr(self.stream, "isatty") and self.stream.isatty():
+                mode = "legacy"
+            else:
+                mode = "plain"
+        self.mode = mode
+        self.size = size
+        self.lines = []
+        self.new_frame = False
+        self.bytes_written = 0
+
+        # what the terminal shows: the last frame's lines, the size it was
+        # drawn at, and how many rows were printed below it since
+        self.shown = None
+        self.shown_size = None
+        self.rows_below = 0
+
+    def clear(self):
+        """Start a new frame; whatever is buffered but unflushed is dropped."""
+        self.lines = []
+        self.new_frame = True
+
+    def write(self, text=""):
+        self.lines.extend(text.split("\n"))
+
+    def echoed(self, prompt):
+        """Account for a prompt and the user's answer echoed by the terminal."""
+        self.rows_below += prompt.count("\n") + 1
+
+    def invalidate(self):
+        """Forget what is on screen, forcing the next frame to be drawn in full."""
+        self.shown = None
+
+    def terminal_size(self):
+        if self.size:
+            return self.size
+        return terminal_size(self.stream)
+
+    def rows(self, line, columns):
+        return max(1, -(-len(line) // columns))
+
+    def full_frame(self):
+        body = "".join(line + ERASE_LINE + "\n" for line in self.lines)
+        return CURSOR_HOME + body + ERASE_BELOW
+
+    def changed_rows(self, columns):
+        old, new = self.shown, self.lines
+        rows = lambda line: self.rows(line, columns)
+
+        # unchanged lines at the top are skipped; an unchanged run at the
+        # bottom (the action menu, separators) is moved with insert/delete
+        # line instead of being rewritten when a block above it grew or shrank
+        head = 0
+        while head < len(old) and head < len(new) and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < len(old) - head and tail < len(new) - head and old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+
+        top = 1 + sum(rows(line) for line in new[:head])
+        old_middle = old[head:len(old) - tail]
+        new_middle = new[head:len(new) - tail]
+        old_end = top + sum(rows(line) for line in old_middle)
+        new_end = top + sum(rows(line) for line in new_middle)
+
+        out = []
+        if tail and new_end > old_end:
+            out.append(move_to(old_end) + INSERT_LINES.format(new_end - old_end))
+        elif tail and new_end < old_end:
+            out.append(move_to(new_end) + DELETE_LINES.format(old_end - new_end))
+
+        # compare each new line with the old line that started on the same row
+        old_at = {}
+        row = top
+        for line in old_middle:
+            if row >= new_end:
+                break
+            old_at[row] = line
+            row += rows(line)
+
+        row = top
+        for line in new_middle:
+            old_line = old_at.get(row)
+            if old_line is None:
+                out.append(move_to(row) + line + ERASE_LINE)
+            elif old_line != line:
+                start = common_prefix(old_line, line)
+                if start and start == len(line) and start % columns == 0:
+                    start -= 1
+                out.append(move_to(row + start // columns, start % columns + 1) + line[start:] + ERASE_LINE)
+            row += rows(line)
+
+        end = new_end + sum(rows(line) for line in new[len(new) - tail:])
+        out.append(move_to(end) + ERASE_BELOW)
+        return "".join(out)
+
+    def compose(self):
+        if not self.new_frame:
+            return "".join(line + "\n" for line in self.lines)
+        if self.mode == "plain":
+            return "\n" + "".join(line + "\n" for line in self.lines)
+        if self.mode == "legacy":
+            return "".join(line + "\n" for line in self.lines)
+
+        columns, height = self.terminal_size()
+        size = (columns, height)
+        frame_rows = sum(self.rows(line, columns) for line in self.lines)
+        shown_rows = sum(self.rows(line, columns) for line in self.shown) if self.shown is not None else 0
+
+        # once anything has scrolled the rows no longer line up, so repaint
+        if (self.shown is None or size != self.shown_size or frame_rows >= height or
+                shown_rows + self.rows_below >= height):
+            frame = self.full_frame()
+        else:
+            frame = self.changed_rows(columns)
+
+        self.shown = list(self.lines)
+        self.shown_size = size
+        self.rows_below = 0
+        return frame
+
+    def flush(self):
+        if not self.lines and not self.new_frame:
+            return
+
+        if self.new_frame and self.mode == "legacy":
+            os.system('cls')
+
+        if not self.new_frame:
+            columns = self.terminal_size()[0] if self.mode == "ansi" else 80
+            self.rows_below += sum(self.rows(line, columns) for line in self.lines)
+
+        frame = self.compose()
+        self.stream.write(frame)
+        self.stream.flush()
+        self.bytes_written += len(frame)
+        self.lines = []
+        self.new_frame = False
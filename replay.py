@@ -0,0 +1,97 @@
+"""Re-run a recorded game headless and seek to any point in it.
+
+A Replay is a starting state (normally the one reset() produces from a seed)
+plus the actions played from there. Since all randomness in a game comes from
+its seeded RNG, playing the same actions from the same state always ends in
+the same place. That is enough to reproduce a player's bug report from their
+journal, or to replay a fixed game on two versions of the code when bisecting
+a balance change.
+
+Seeking plays actions forward from the nearest in-memory checkpoint at or
+before the target. Checkpoints are export_state() dicts, taken every
+`checkpoint_every` actions as the replay passes them, so seeking around a
+long game replays at most that many actions once the game has been played
+through.
+"""
+import bisect
+
+from journal import JOURNAL_FILE, read_entries
+from main import ChronoSyncGame
+
+
+class Replay:
+    """A recorded game: start state, actions (as Action.record() lists) and the
+    stability/energy each action led to.
+
+    It also works as a game's journal (`game.journal = Replay()`) to record a
+    headless game in memory.
+    """
+    def __init__(self, initial=None, actions=(), outcomes=(), checkpoint_every=250):
+        self.initial = initial
+        self.actions = list(actions)
+        self.outcomes = list(outcomes)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoints = {0: initial} if initial is not None else {}
+        self.checkpoint_turns = sorted(self.checkpoints)
+
+    @classmethod
+    def from_seed(cls, difficulty, seed, actions=(), player_name="Analyst", checkpoint_every=250):
+        game = ChronoSyncGame()
+        game.reset(difficulty, player_name, seed)
+        return cls(game.export_state(), actions, checkpoint_every=checkpoint_every)
+
+    @classmethod
+    def from_journal(cls, path=JOURNAL_FILE, checkpoint_every=250):
+        """Everything a journal recorded since its first snapshot."""
+        entries = read_entries(path)
+        first = next(i for i, entry in enumerate(entries) if "snapshot" in entry)
+        records = [entry for entry in entries[first:] if "action" in entry]
+        return cls(entries[first]["snapshot"], [r["action"] for r in records],
+                   [r["outcome"] for r in records], checkpoint_every)
+
+    @property
+    def started(self):
+        return self.initial is not None
+
+    def begin(self, game):
+        self.__init__(game.export_state(), checkpoint_every=self.checkpoint_every)
+
+    def restart(self):
+        self.initial = None
+
+    def record(self, game, action):
+        self.actions.append(action.record())
+        self.outcomes.append([game.timeline_stability, game.chrono_energy])
+
+    def __len__(self):
+        return len(self.actions)
+
+    def checkpoint(self, turn, game):
+        if turn not in self.checkpoints:
+            self.checkpoints[turn] = game.export_state()
+            bisect.insort(self.checkpoint_turns, turn)
+
+    def seek(self, turn):
+        """A headless game as it was after the first `turn` recorded actions."""
+        if not 0 <= turn <= len(self.actions):
+            raise IndexError(f"turn {turn} is outside the recording (0-{len(self.actions)})")
+
+        start = self.checkpoint_turns[bisect.bisect_right(self.checkpoint_turns, turn) - 1]
+        game = ChronoSyncGame()
+        game.headless = True
+        game.import_state(self.checkpoints[start])
+        for index in range(start, turn):
+            game.replay_record(self.actions[index])
+            if (index + 1) % self.checkpoint_every == 0:
+                self.checkpoint(index + 1, game)
+        return game
+
+    def first_divergence(self):
+        """Index of the first action whose outcome differs from the recording
+        (so the rules changed since it was made), or None."""
+        game = self.seek(0)
+        for index, action in enumerate(self.actions):
+            game.replay_record(action)
+            if index < len(self.outcomes) and [game.timeline_stability, game.chrono_energy] != self.outcomes[index]:
+                return index
+        return None
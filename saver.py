@@ -0,0 +1,120 @@
+"""Crash-safe saves written off the game thread.
+
+The game hands BackgroundSaver a state dict (export_state() builds a fresh
+one, so taking it is cheap and the game may carry on changing). A writer
+thread serializes it to a temporary file next to the target, fsyncs it, and
+renames it over the save. A crash mid-write therefore leaves the previous
+save intact, and a slow disk never stalls the turn loop. If several saves
+to the same file queue up before the writer gets to them, only the newest
+one is written.
+"""
+import atexit
+import json
+import os
+import threading
+
+
+def write_atomic(path, data):
+    """Replace `path` with `data` (str or bytes) so readers only ever see the old or the new file."""
+    # imported here, not at startup: tempfile pulls in shutil and friends
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private; keep the mode the save had
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp, mode)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+    if os.name != "nt":
+        # make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class BackgroundSaver:
+    """Queues writes for a writer thread, which is started on the first one.
+
+    A write is a callable queued under a key (normally the file it writes);
+    a newer write under the same key replaces one still waiting.
+    """
+    def __init__(self):
+        self.pending = {}
+        self.writing = False
+        self.error = None
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def save(self, path, state):
+        """Write `state` to `path` as JSON."""
+        self.submit(path, lambda: write_atomic(path, json.dumps(state)))
+
+    def submit(self, key, write):
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("saver is closed")
+            self.pending[key] = write
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="chrono-sync-saver", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+            self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                write = self.pending.pop(next(iter(self.pending)))
+                self.writing = True
+
+            try:
+                write()
+            except Exception as e:
+                error = e
+            else:
+                error = None
+
+            with self.condition:
+                self.writing = False
+                if error is not None:
+                    self.error = error
+                self.condition.notify_all()
+
+    def flush(self):
+        """Wait until every queued save is on disk."""
+        with self.condition:
+            while self.pending or self.writing:
+                self.condition.wait()
+
+    def take_error(self):
+        """The last failed write since this was called, or None."""
+        with self.condition:
+            error, self.error = self.error, None
+            return error
+
+    def close(self):
+        """Write whatever is still queued and stop the writer thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        atexit.unregister(self.close)
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
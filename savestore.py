@@ -0,0 +1,187 @@
+"""Numbered save slots that can be listed without reading the saves.
+
+Each slot is one file: a fixed-layout binary header followed by the JSON
+game state. The header holds what the archive menu shows: player name,
+difficulty, game time, stability and paradoxes resolved, plus when the slot
+was saved and how long the payload is. An index file keeps a copy of every
+slot's header at a fixed offset (slot n at (n - 1) * HEADER.size), so the
+menu reads one small file to list every slot. Updating a slot rewrites only
+its own index record. The payload is read only when a slot is loaded.
+
+The slot files are the source of truth. If the index is missing or a record
+is unreadable, it is rebuilt from the slot headers.
+
+Before slots, the game kept one save in chrono_sync_save.json next to the
+save directory. The first time a store without a directory is used, that
+file is copied into slot 1 (ChronoSyncGame.import_state still reads it).
+"""
+import json
+import os
+import struct
+import time
+
+from saver import write_atomic
+
+SAVE_DIR = "chrono_sync_saves"
+LEGACY_SAVE = "chrono_sync_save.json"
+# keeps the index small: it has a record for every slot up to the highest used
+MAX_SLOTS = 999
+MAGIC = b"CSYN"
+VERSION = 1
+
+# magic, version, player name, difficulty, game_time, stability, paradoxes
+# resolved, saved at (unix time), payload bytes
+HEADER = struct.Struct("<4sH32s8sIiIdI")
+
+
+class SlotHeader:
+    __slots__ = ("slot", "player_name", "difficulty", "game_time", "stability",
+                 "paradoxes_resolved", "saved_at", "payload_size")
+
+    def __init__(self, slot, player_name, difficulty, game_time, stability, paradoxes_resolved,
+                 saved_at, payload_size):
+        self.slot = slot
+        self.player_name = player_name
+        self.difficulty = difficulty
+        self.game_time = game_time
+        self.stability = stability
+        self.paradoxes_resolved = paradoxes_resolved
+        self.saved_at = saved_at
+        self.payload_size = payload_size
+
+    def pack(self):
+        return HEADER.pack(MAGIC, VERSION, self.player_name.encode("utf-8")[:32],
+                           self.difficulty.encode("ascii")[:8], self.game_time, self.stability,
+                           self.paradoxes_resolved, self.saved_at, self.payload_size)
+
+    @staticmethod
+    def unpack(slot, data):
+        """The header in `data`, or None when it is empty or not a header."""
+        if len(data) < HEADER.size:
+            return None
+        fields = HEADER.unpack(data[:HEADER.size])
+        if fields[0] != MAGIC or fields[1] != VERSION:
+            return None
+        name = fields[2].rstrip(b"\0").decode("utf-8", errors="ignore")
+        difficulty = fields[3].rstrip(b"\0").decode("ascii", errors="ignore")
+        return SlotHeader(slot, name, difficulty, *fields[4:])
+
+
+class SaveStore:
+    def __init__(self, directory=SAVE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.dat")
+        self.legacy_path = os.path.join(os.path.dirname(os.path.normpath(directory)), LEGACY_SAVE)
+        self.legacy_checked = False
+
+    def import_legacy(self):
+        """Copy the old single-file save into slot 1 if this store has never been used.
+        Tried once per store; an old save that cannot be read is renamed to .bak."""
+        if self.legacy_checked:
+            return
+        self.legacy_checked = True
+        if os.path.isdir(self.directory) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r") as f:
+                self.write(1, json.load(f))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            try:
+                os.replace(self.legacy_path, self.legacy_path + ".bak")
+            except OSError:
+                pass
+
+    @staticmethod
+    def check_slot(slot):
+        if not 1 <= slot <= MAX_SLOTS:
+            raise ValueError(f"invalid save slot {slot} (slots are 1 to {MAX_SLOTS})")
+
+    def slot_path(self, slot):
+        return os.path.join(self.directory, f"slot_{slot:03d}.sav")
+
+    def write(self, slot, state):
+        """Write `state` (an export_state() dict) to `slot`, then its index record."""
+        self.check_slot(slot)
+        os.makedirs(self.directory, exist_ok=True)
+        payload = json.dumps(state).encode("utf-8")
+        header = SlotHeader(slot, state["player_name"], state["difficulty"], state["game_time"],
+                            state["timeline_stability"], state["paradoxes_resolved"], time.time(), len(payload))
+        record = header.pack()
+        write_atomic(self.slot_path(slot), record + payload)
+
+        mode = "r+b" if os.path.exists(self.index_path) else "w+b"
+        with open(self.index_path, mode) as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            offset = (slot - 1) * HEADER.size
+            if end < offset:
+                f.write(bytes(offset - end))
+            f.seek(offset)
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def headers(self):
+        """Headers of every occupied slot, by slot number, from the index alone."""
+        self.import_legacy()
+        try:
+            with open(self.index_path, "rb") as f:
+                index = f.read()
+        except FileNotFoundError:
+            return self.rebuild_index()
+
+        found = []
+        for offset in range(0, len(index) - HEADER.size + 1, HEADER.size):
+            record = index[offset:offset + HEADER.size]
+            if not any(record):
+                continue
+            header = SlotHeader.unpack(offset // HEADER.size + 1, record)
+            if header is None:
+                return self.rebuild_index()
+            found.append(header)
+        return found
+
+    def rebuild_index(self):
+        headers = []
+        if os.path.isdir(self.directory):
+            for name in sorted(os.listdir(self.directory)):
+                if not (name.startswith("slot_") and name.endswith(".sav")):
+                    continue
+                # skip stray files: only slot_001.sav to the last slot are slots
+                number = name[5:-4]
+                if not number.isdigit() or not 1 <= int(number) <= MAX_SLOTS:
+                    continue
+                slot = int(number)
+                if name != os.path.basename(self.slot_path(slot)):
+                    continue
+                with open(os.path.join(self.directory, name), "rb") as f:
+                    header = SlotHeader.unpack(slot, f.read(HEADER.size))
+                if header is not None:
+                    headers.append(header)
+        headers.sort(key=lambda header: header.slot)
+
+        index = bytearray()
+        for header in headers:
+            offset = (header.slot - 1) * HEADER.size
+            index.extend(bytes(offset - len(index)))
+            index.extend(header.pack())
+        if headers:
+            write_atomic(self.index_path, bytes(index))
+        return headers
+
+    def next_free_slot(self):
+        used = {header.slot for header in self.headers()}
+        slot = 1
+        while slot in used:
+            slot += 1
+        return slot
+
+    def load(self, slot):
+        """The saved state in `slot`; raises FileNotFoundError for an empty slot."""
+        self.check_slot(slot)
+        self.import_legacy()
+        with open(self.slot_path(slot), "rb") as f:
+            header = SlotHeader.unpack(slot, f.read(HEADER.size))
+            if header is None:
+                raise ValueError(f"slot {slot} is not a Chrono-Sync save")
+            return json.loads(f.read(header.payload_size).decode("utf-8"))
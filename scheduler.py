@@ -0,0 +1,74 @@
+"""Expiry scheduling for the running temporal events of one game.
+
+Events used to count themselves down one turn at a time and were removed
+from a list as they expired, which touched every event every turn. The
+scheduler instead stores when each event expires, in turns of game_time, in a
+min-heap, so a turn only looks at the events that actually end. Time
+Dilation extends everything currently running; that is one shared offset
+added to every key, and events scheduled later subtract the offset at the
+time they start so they are not stretched by earlier dilations.
+"""
+import heapq
+import itertools
+
+
+class EventScheduler:
+    """Running events in start order (what the UI shows) plus a heap of expiry times."""
+    def __init__(self, clock=0):
+        self.clock = clock
+        self.offset = 0
+        self.heap = []
+        self.running = {}
+        self.counter = itertools.count()
+
+    def add(self, event, remaining=None):
+        """Start `event` now; it expires after `remaining` turns (its duration by default)."""
+        if remaining is None:
+            remaining = event.duration
+        event.expires = self.clock + remaining - self.offset
+        event.schedule = self
+        self.running[event] = None
+        heapq.heappush(self.heap, (event.expires, next(self.counter), event))
+
+    def extend(self, turns):
+        """Add `turns` to every running event."""
+        self.offset += turns
+
+    def remaining(self, event):
+        return event.expires + self.offset - self.clock
+
+    def advance(self, clock):
+        """Move to `clock` and return the events that have expired by then, earliest first."""
+        self.clock = clock
+        expired = []
+        while self.heap and self.heap[0][0] + self.offset <= clock:
+            event = heapq.heappop(self.heap)[2]
+            del self.running[event]
+            expired.append(event)
+        if not self.heap:
+            self.offset = 0
+        return expired
+
+    def copy(self, copy_event):
+        """An identical schedule of copies of its events; copy_event(event) makes one."""
+        other = EventScheduler(self.clock)
+        other.offset = self.offset
+        # the counter keeps going from here, so ties still break in start order
+        other.counter = itertools.count(next(self.counter))
+        copies = {}
+        for event in self.running:
+            copies[event] = copy = copy_event(event)
+            copy.expires = event.expires
+            copy.schedule = other
+            other.running[copy] = None
+        other.heap = [(expires, n, copies[event]) for expires, n, event in self.heap]
+        return other
+
+    def __iter__(self):
+        return iter(self.running)
+
+    def __len__(self):
+        return len(self.running)
+
+    def __bool__(self):
+        return bool(self.running)
@@ -0,0 +1,249 @@
+"""Host many Chrono-Sync games from one process over a telnet-style line protocol.
+
+Every connection gets its own ChronoSyncGame. The session plays it through the
+headless API (Action and play()) and the game's own screen-writing methods,
+so a player waiting at a prompt is a coroutine waiting on its socket, not a
+blocked input() call, and an idle session costs little more than its game
+state. Try it with `python server.py` and `telnet localhost 7777` (or nc).
+
+Each session composes its screens in its own TerminalRenderer and sends them
+in one write per prompt. Before reading the next line it waits for the client
+to take that output (backpressure), so a client that stops reading cannot make
+the server buffer more than about `write_limit` bytes for it. A session that
+sends nothing for `idle_timeout` seconds, or stalls on its output for that
+long, is closed.
+
+The archive (S) is not available in sessions. They all share the server's
+working directory, and nothing identifies a player across connections. For
+the same reasons, sessions are not journaled.
+"""
+import argparse
+import asyncio
+
+from main import Action, ActionType, ChronoSyncGame
+from metrics import Metrics, instrument
+from renderer import TerminalRenderer
+
+MAX_LINE = 1024
+
+
+class SessionClosed(Exception):
+    pass
+
+
+class SessionStream:
+    """Output stream for a session's renderer; text goes to the connection's buffer."""
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, text):
+        self.writer.write(text.replace("\n", "\r\n").encode("utf-8"))
+
+    def flush(self):
+        pass
+
+
+def parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+class Session:
+    def __init__(self, reader, writer, idle_timeout=300, ansi=False):
+        self.reader = reader
+        self.writer = writer
+        self.idle_timeout = idle_timeout
+        self.stream = SessionStream(writer)
+        self.game = ChronoSyncGame()
+        self.game.screen = TerminalRenderer(self.stream, "ansi" if ansi else "plain", size=(80, 24))
+
+    async def ask(self, prompt=""):
+        """Send the buffered screen and `prompt`, then wait for the player's line."""
+        self.game.screen.flush()
+        self.stream.write(prompt)
+        await self.drain()
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            raise SessionClosed("Session closed after being idle too long.")
+        except ValueError:
+            raise SessionClosed("Input line too long.")
+        if not line:
+            raise SessionClosed("")
+        self.game.screen.echoed(prompt)
+        return line.decode("utf-8", errors="replace").strip("\r\n")
+
+    async def drain(self):
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            self.writer.transport.abort()
+            raise SessionClosed("")
+
+    async def run(self):
+        """The same conversation as ChronoSyncGame.start and main_loop."""
+        game = self.game
+        game.clear_screen()
+        game.screen.write(game.center_text("CHRONO-SYNC: TEMPORAL PARADOX SOLVER"))
+        game.screen.write(game.center_text("A Temporal Adventure Through History"))
+        game.screen.write("\n" * 2)
+
+        game.write_difficulties()
+        game.choose_difficulty(await self.ask("\nSelect difficulty: "))
+        await self.ask("\nPress Enter to continue...")
+        game.display_story_beat(0)
+        await self.ask("\nPress Enter to begin your mission...")
+        game.player_name = (await self.ask("\nEnter your name as a Temporal Analyst: ")).strip()[:32] or "Analyst"
+
+        game.begin_mission()
+        game.advance_turn()
+        while not game.game_over:
+            game.display()
+            game.write_actions()
+            beat = game.current_story_beat
+            await self.take_turn(await self.ask("\nSelect action: "))
+            if not game.game_over and game.current_story_beat != beat:
+                game.display_story_beat(game.current_story_beat)
+                await self.ask("\nPress Enter to continue...")
+
+        game.display_final_outcome()
+        await self.drain()
+
+    async def take_turn(self, choice):
+        game = self.game
+        try:
+            kind = ActionType(choice.strip().upper())
+        except ValueError:
+            kind = None
+        action = Action(kind)
+
+        if kind is ActionType.SAVE_LOAD:
+            game.last_action = ""
+            game.action_result = "The temporal archive is not available in online sessions"
+            return
+
+        menu = game.target_menu(kind)
+        if menu and menu[1]:
+            heading, options, prompt = menu
+            game.write_menu(heading, options)
+            action.target = parse_number(await self.ask(prompt))
+
+        if kind is ActionType.NPC and action.target is not None and 1 <= action.target <= len(game.era_npcs()):
+            npc = game.era_npcs()[action.target - 1]
+            game.write_npc(npc)
+            if npc.quest and npc.name not in game.completed_quests:
+                action.accept = (await self.ask("\nAttempt to complete quest? (Y/N): ")).strip().upper() == "Y"
+            await self.ask("\nPress Enter to continue...")
+        elif kind is ActionType.INVENTORY:
+            game.write_inventory()
+            await self.ask("\nPress Enter to continue...")
+        elif kind is ActionType.REPORT:
+            game.write_report()
+            await self.ask("\nPress Enter to continue...")
+        elif kind is ActionType.EVENT_INFO and (game.known_events or game.events):
+            game.write_event_info()
+            await self.ask("\nPress Enter to continue...")
+
+        # a resolve stops before each guess for the player's answer
+        steps = game.play(action)
+        try:
+            request = next(steps)
+            game.write_resolution(game.discovered_entities[action.target - 1])
+            while True:
+                game.write_frequency_hint(*request)
+                request = steps.send(parse_number(await self.ask("Enter frequency: ")))
+        except StopIteration:
+            pass
+
+
+class GameServer:
+    def __init__(self, host="127.0.0.1", port=7777, idle_timeout=300, max_sessions=10000,
+                 write_limit=64 * 1024, ansi=False, metrics_path=None, metrics_interval=10):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.write_limit = write_limit
+        self.ansi = ansi
+        self.sessions = set()
+        # one set of metrics for every session, written out every metrics_interval seconds
+        self.metrics = Metrics() if metrics_path else None
+        self.metrics_path = metrics_path
+        self.metrics_interval = metrics_interval
+
+    async def handle(self, reader, writer):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"The Chronos Institute is at capacity. Please try again later.\r\n")
+            await self.close(writer)
+            return
+
+        writer.transport.set_write_buffer_limits(high=self.write_limit)
+        session = Session(reader, writer, self.idle_timeout, self.ansi)
+        if self.metrics:
+            instrument(session.game, self.metrics)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        except SessionClosed as e:
+            if str(e):
+                writer.write(f"\r\n{e}\r\n".encode("utf-8"))
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            if session.game.background_saver is not None:
+                # joining the writer thread can wait on the disk, so not on the event loop
+                await asyncio.get_running_loop().run_in_executor(None, session.game.close_saver)
+            await self.close(writer)
+
+    @staticmethod
+    async def close(writer):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def start(self):
+        """Start listening (port 0 picks a free port) and return the asyncio server."""
+        server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+    async def serve(self):
+        server = await self.start()
+        if self.metrics:
+            asyncio.create_task(self.export_metrics())
+        async with server:
+            await server.serve_forever()
+
+    async def export_metrics(self):
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            self.metrics.write(self.metrics_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host Chrono-Sync games over a telnet-style line protocol")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--idle-timeout", type=float, default=300, help="seconds before an idle session is closed")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--ansi", action="store_true", help="redraw screens in place with ANSI escapes")
+    parser.add_argument("--metrics", metavar="FILE", help="time every session's turns and actions into FILE (Prometheus text)")
+    parser.add_argument("--metrics-interval", type=float, default=10, help="seconds between writes of the metrics file")
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.host, args.port, args.idle_timeout, args.max_sessions, ansi=args.ansi,
+                        metrics_path=args.metrics, metrics_interval=args.metrics_interval)
+    print(f"Chrono-Sync server listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Seeded random streams, one per subsystem of a game.
+
+A game draws all of its randomness from its own RandomStreams, never from
+the random module, so games in one process never share a generator and a
+seed always replays the same game. The streams are independent generators:
+
+    world       events, spawns, discoveries and the hazards of a jump
+    loot        items found, rewards and what rest and stabilize yield
+    minigame    the frequency to find in the paradox minigame
+    decay       stability decay and energy regeneration each turn
+
+so an extra draw in one subsystem (a new item, say) leaves the sequences of
+the others, and the world the player sees, unchanged.
+
+With fast=True the streams are FastRandom generators, whose randint and
+choice cost one uniform draw each instead of random.Random's rejection
+sampling, the main per-call cost of the headless simulator's random draws.
+A fast game is as reproducible as any other, but plays out differently from
+a standard game with the same seed.
+"""
+import random
+
+STREAMS = ("world", "loot", "minigame", "decay")
+
+
+class FastRandom(random.Random):
+    """random.Random with randint and choice scaled from a single uniform.
+
+    The results are uniform to within n / 2**53 for a range of n values.
+    """
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+
+class RandomStreams:
+    """The streams of one game. copy() is copy-on-write: the copy and the
+    original share each generator until one of them draws from it, and only
+    then is that one generator copied, so streams a game never draws from
+    again after a fork or snapshot are never copied at all."""
+    def __init__(self, seed=None, fast=False):
+        self.fast = fast
+        self.shared = {}
+        self.seed(seed)
+
+    @classmethod
+    def single(cls, rng):
+        """Streams that all draw from the one generator `rng`, for search code
+        that reseeds it at every step and would pay for reseeding four."""
+        streams = cls.__new__(cls)
+        streams.fast = isinstance(rng, FastRandom)
+        streams.shared = {}
+        for name in STREAMS:
+            setattr(streams, name, rng)
+        return streams
+
+    def seed(self, seed=None):
+        """Reseed every stream with its own seed derived from `seed` (random when None)."""
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.base_seed = seed
+        self.release()
+
+    def release(self):
+        # drop every stream, giving up this object's share of the shared ones
+        for name in STREAMS:
+            self.__dict__.pop(name, None)
+        self.__del__()
+        self.shared = {}
+
+    def __del__(self):
+        # the other holders of a shared generator need not copy it for us
+        for share in self.shared.values():
+            share[1] -= 1
+
+    def __getattr__(self, name):
+        # a stream is only seeded when it is first used, and a shared one
+        # is only copied when it is first used, by all but its last holder
+        if name not in STREAMS:
+            raise AttributeError(name)
+        share = self.shared.pop(name, None)
+        if share is None:
+            rng = (FastRandom if self.fast else random.Random)(f"{self.base_seed}:{name}")
+        elif share[1] > 1:
+            share[1] -= 1
+            rng = self.generator(share[0].getstate())
+        else:
+            rng = share[0]
+        setattr(self, name, rng)
+        return rng
+
+    def generator(self, state):
+        generator = FastRandom if self.fast else random.Random
+        rng = generator.__new__(generator)
+        rng.setstate(state)
+        return rng
+
+    def stream(self, name):
+        """The generator of stream `name`, without claiming a shared one."""
+        share = self.shared.get(name)
+        return getattr(self, name) if share is None else share[0]
+
+    def getstate(self):
+        return self.fast, tuple(self.stream(name).getstate() for name in STREAMS)
+
+    def setstate(self, state):
+        self.release()
+        self.fast, states = state
+        for name, stream_state in zip(STREAMS, states):
+            setattr(self, name, self.generator(stream_state))
+
+    def copy(self):
+        other = RandomStreams.__new__(RandomStreams)
+        other.fast = self.fast
+        other.base_seed = self.base_seed
+        other.shared = {}
+        for name in STREAMS:
+            share = self.shared.get(name)
+            if share is None:
+                rng = self.__dict__.pop(name, None)
+                if rng is None:
+                    # never seeded: both seed it themselves if they use it
+                    continue
+                share = self.shared[name] = [rng, 1]
+            share[1] += 1
+            other.shared[name] = share
+        return other
@@ -0,0 +1,127 @@
+"""Pit scripted policies against each other across difficulties.
+
+Seeded games are split into shards and spread over a process pool; each
+shard plays its games headless and returns running totals, which are merged
+per (policy, difficulty). Every policy sees the same seeds, so the numbers
+are directly comparable.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from main import ChronoSyncGame, DIFFICULTY_SETTINGS
+from policies import POLICIES
+
+
+def game_seed(seed, difficulty, index):
+    return f"{seed}:{difficulty}:{index}"
+
+
+def play_game(policy, difficulty, seed, max_turns=500, fast_rng=False):
+    """Play one headless game to the end. Returns (win, turns, paradoxes resolved)."""
+    game = ChronoSyncGame()
+    if hasattr(policy, "reset"):
+        policy.reset(seed)
+    obs = game.reset(difficulty, seed=seed, fast_rng=fast_rng)
+    while not obs["game_over"] and game.game_time < max_turns:
+        obs = game.step(policy(game))
+    return game.win, game.game_time, game.paradoxes_resolved
+
+
+def play_shard(shard):
+    name, policy, difficulty, seed, start, stop, max_turns, fast_rng = shard
+    policy = POLICIES[policy] if isinstance(policy, str) else policy
+    totals = {"games": 0, "wins": 0, "turns": 0, "paradoxes_resolved": 0}
+    for index in range(start, stop):
+        win, turns, resolved = play_game(policy, difficulty, game_seed(seed, difficulty, index), max_turns, fast_rng)
+        totals["games"] += 1
+        totals["wins"] += win
+        totals["turns"] += turns
+        totals["paradoxes_resolved"] += resolved
+    return name, difficulty, totals
+
+
+def make_shards(policies, difficulties, games, seed, shard_size, max_turns, fast_rng=False):
+    for name, policy in policies.items():
+        for difficulty in difficulties:
+            for start in range(0, games, shard_size):
+                yield name, policy, difficulty, seed, start, min(games, start + shard_size), max_turns, fast_rng
+
+
+def run_tournament(policies=None, difficulties=tuple(DIFFICULTY_SETTINGS), games=1000, seed=0,
+                   workers=None, max_turns=500, shard_size=None, fast_rng=False):
+    """Play `games` seeded games per policy and difficulty.
+
+    `policies` maps a display name to a policy callable or to a key of
+    policies.POLICIES (names are cheaper to send to workers). Returns
+    {(name, difficulty): {"games", "win_rate", "avg_turns", "avg_paradoxes_resolved"}}.
+    With workers=1 everything runs in-process; fast_rng plays the games with
+    the fast RNG streams (see streams.py).
+    """
+    if policies is None:
+        policies = {name: name for name in POLICIES}
+    elif not isinstance(policies, dict):
+        policies = {name: name for name in policies}
+
+    workers = workers or os.cpu_count() or 1
+    if shard_size is None:
+        # a few shards per worker keeps the pool busy without drowning it in tiny tasks
+        total = games * len(policies) * len(difficulties)
+        shard_size = max(1, min(games, total // (workers * 4) or 1))
+    shards = list(make_shards(policies, difficulties, games, seed, shard_size, max_turns, fast_rng))
+
+    if workers == 1:
+        results = map(play_shard, shards)
+        return merge(results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge(pool.map(play_shard, shards))
+
+
+def merge(results):
+    merged = {}
+    for name, difficulty, totals in results:
+        into = merged.setdefault((name, difficulty), dict.fromkeys(totals, 0))
+        for key, value in totals.items():
+            into[key] += value
+
+    summary = {}
+    for key, totals in merged.items():
+        games = totals["games"]
+        summary[key] = {
+            "games": games,
+            "win_rate": totals["wins"] / games,
+            "avg_turns": totals["turns"] / games,
+            "avg_paradoxes_resolved": totals["paradoxes_resolved"] / games
+        }
+    return summary
+
+
+def format_table(summary):
+    lines = [f"{'POLICY':<12} {'DIFFICULTY':<10} {'GAMES':>7} {'WIN RATE':>9} {'TURNS':>7} {'RESOLVED':>9}"]
+    for (name, difficulty), row in sorted(summary.items(), key=lambda item: (item[0][0], list(DIFFICULTY_SETTINGS).index(item[0][1]))):
+        lines.append(f"{name:<12} {difficulty:<10} {row['games']:>7} {row['win_rate']:>9.3f} "
+                     f"{row['avg_turns']:>7.1f} {row['avg_paradoxes_resolved']:>9.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Chrono-Sync policy tournament")
+    parser.add_argument("--policies", nargs="+", choices=sorted(POLICIES), default=sorted(POLICIES))
+    parser.add_argument("--difficulties", nargs="+", choices=list(DIFFICULTY_SETTINGS), default=list(DIFFICULTY_SETTINGS))
+    parser.add_argument("--games", type=int, default=1000, help="games per policy and difficulty")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-turns", type=int, default=500)
+    parser.add_argument("--fast-rng", action="store_true", help="use the fast RNG streams (different games per seed)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    summary = run_tournament(args.policies, args.difficulties, args.games, args.seed,
+                             args.workers, args.max_turns, fast_rng=args.fast_rng)
+    print(format_table(summary))
+    print(f"\n{sum(row['games'] for row in summary.values())} games in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()